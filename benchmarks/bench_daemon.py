@@ -0,0 +1,72 @@
+"""Benchmark: `termixai ask` latency through the daemon against answering in-process.
+
+Starts `termixai daemon` on the replay provider (no artificial latency) in a throwaway
+HOME, then runs `termixai ask` in fresh interpreters, once through the daemon and once
+with --no-daemon, and reports:
+
+- first byte: process start to the first answer byte on stdout, an upper bound for
+  the time until the request is sent, since the replay model answers at once
+- total: process start to exit
+- baseline: a bare `python -c pass`, the interpreter's own share of both
+
+    python benchmarks/bench_daemon.py [--runs 20]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def timed(argv: list, env: dict) -> tuple:
+    """(first stdout byte, exit) in seconds after starting `argv`."""
+    started = time.perf_counter()
+    process = subprocess.Popen(argv, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    process.stdout.read(1)
+    first_byte = time.perf_counter() - started
+    process.stdout.read()
+    process.wait()
+    return first_byte, time.perf_counter() - started
+
+
+def report(label: str, samples: list) -> None:
+    first = [sample[0] * 1000 for sample in samples]
+    total = [sample[1] * 1000 for sample in samples]
+    print(f"{label:<22}{statistics.median(first):>10.1f}{statistics.median(total):>10.1f}{max(total):>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, HOME=home, XDG_CONFIG_HOME=os.path.join(home, ".config"),
+                   XDG_CACHE_HOME=os.path.join(home, ".cache"), TERMIXAI_SOCKET=os.path.join(home, "run", "daemon.sock"))
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), env.get("PYTHONPATH")]))
+        os.makedirs(os.path.join(home, ".config", "termixai"))
+        os.makedirs(os.path.join(home, "run"), mode=0o700)
+        with open(os.path.join(home, ".config", "termixai", "config.json"), "w") as f:
+            json.dump({"models": {"replay": {"provider": "replay", "model_name": "replay",
+                                             "first_token_latency": 0, "chunk_interval": 0}},
+                       "response_cache": {"enabled": False}}, f)
+
+        daemon = subprocess.Popen([sys.executable, "-m", "termixai.cli", "daemon"], env=env,
+                                  stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        try:
+            daemon.stdout.readline()  # printed once it listens
+            ask = [sys.executable, "-m", "termixai.cli", "ask", "how", "full", "is", "the", "disk"]
+            print(f"{'':<22}{'first ms':>10}{'total ms':>10}{'max ms':>10}")
+            report("baseline (python)", [timed([sys.executable, "-c", "print()"], env) for _ in range(args.runs)])
+            report("ask via daemon", [timed(ask, env) for _ in range(args.runs)])
+            report("ask --no-daemon", [timed(ask + ["--no-daemon"], env) for _ in range(args.runs)])
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Benchmark: end-to-end chat latency of ChatUI against the replay provider.
+
+Drives the real app headlessly with Textual's pilot for N turns, alternating a plain
+answer and a tool turn (approve a command, run it, stream the follow-up), and reports:
+
+- first render: Enter to the first response text or command approval on screen
+- full render: Enter to the whole answer rendered and the input enabled again
+- tool round trip: Approve to the follow-up answer fully rendered
+- auto tool turn (with --auto-approve): Enter to the follow-up answer of an auto-approved command
+- memory: process RSS before and after, and growth per turn
+
+    python benchmarks/bench_e2e.py [--turns 50] [--first-token 0.2] [--chunk-chars 8] [--chunk-interval 0.01]
+    python benchmarks/bench_e2e.py --auto-approve
+    python benchmarks/bench_e2e.py --script recorded.json
+
+Runs in a throwaway HOME, so no real config, history or caches are touched. The
+response and command caches are off, so every turn goes through the provider and shell.
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+## config paths are resolved when termixai is imported, so point HOME somewhere private first
+_home = tempfile.mkdtemp(prefix="termixai-bench-")
+os.environ.update(HOME=_home, XDG_CONFIG_HOME=os.path.join(_home, ".config"),
+                  XDG_CACHE_HOME=os.path.join(_home, ".cache"))
+
+from termixai.inface import ChatUI, CommandApproval, CommandOutput, Response  # noqa: E402
+from termixai.utils.config import CONFIG_FILE  # noqa: E402
+
+POLL = 0.002
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def write_config(args) -> None:
+    model = {
+        "provider": "replay",
+        "model_name": "replay",
+        "first_token_latency": args.first_token,
+        "chunk_chars": args.chunk_chars,
+        "chunk_interval": args.chunk_interval,
+    }
+    if args.script:
+        model["script"] = os.path.abspath(args.script)
+    with open(CONFIG_FILE, "w") as f:
+        json.dump({
+            "models": {"replay": model},
+            "response_cache": {"enabled": False},
+            "command_cache": {"enabled": False},
+            "approval_policy": {"enabled": args.auto_approve},
+        }, f)
+
+
+async def wait_for(condition, timeout: float = 30.0) -> float:
+    started = time.perf_counter()
+    while not condition():
+        if time.perf_counter() - started > timeout:
+            raise TimeoutError("the app did not reach the expected state")
+        await asyncio.sleep(POLL)
+    return time.perf_counter()
+
+
+def last_widget(app):
+    children = app.query_one("#chat-view").children
+    return children[-1] if children else None
+
+
+def rendered(app, before) -> bool:
+    widget = last_widget(app)
+    if widget is before:
+        return False
+    if isinstance(widget, (CommandApproval, CommandOutput)):
+        return True
+    return isinstance(widget, Response) and bool(widget.source)
+
+
+def summary(samples: list) -> str:
+    if not samples:
+        return f"{'-':>9}{'-':>9}{'-':>9}"
+    p95 = statistics.quantiles(samples, n=20, method="inclusive")[-1] if len(samples) > 1 else samples[0]
+    return f"{statistics.median(samples) * 1000:>9.1f}{p95 * 1000:>9.1f}{max(samples) * 1000:>9.1f}"
+
+
+async def run(turns: int) -> None:
+    app = ChatUI()
+    first_render, full_render, tool_round_trip, auto_tool_turn = [], [], [], []
+    async with app.run_test(size=(120, 40)) as pilot:
+        await wait_for(lambda: app.active_view is not None)
+        view = app.active_view
+        view.query_one("#model_select").value = "replay"
+        await wait_for(lambda: view.session.model is not None)
+        field = view.input_field
+        await pilot.pause()
+        rss_before = rss_mb()
+
+        for turn in range(turns):
+            field.value = f"question {turn}: what is using my disk?"
+            before = last_widget(app)
+            started = time.perf_counter()
+            await field.action_submit()
+            shown = await wait_for(lambda: rendered(app, before))
+            first_render.append(shown - started)
+
+            if isinstance(last_widget(app), CommandApproval):
+                ## wait until every proposed command has its approval form ready
+                await wait_for(lambda: len(app.query("CommandApproval #approve")) == view.session.total_tool_calls)
+                approved = time.perf_counter()
+                for approval in app.query(CommandApproval):
+                    approval.query_one("#approve").press()
+                done = await wait_for(lambda: not field.disabled)
+                tool_round_trip.append(done - approved)
+            elif isinstance(last_widget(app), CommandOutput):
+                done = await wait_for(lambda: not field.disabled)
+                auto_tool_turn.append(done - started)
+            else:
+                done = await wait_for(lambda: not field.disabled)
+                full_render.append(done - started)
+        await pilot.pause()
+        rss_after = rss_mb()
+
+    print(f"{'metric':<18}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}")
+    print(f"{'first render':<18}{summary(first_render)}")
+    print(f"{'full render':<18}{summary(full_render)}")
+    print(f"{'tool round trip':<18}{summary(tool_round_trip)}")
+    if auto_tool_turn:
+        print(f"{'auto tool turn':<18}{summary(auto_tool_turn)}")
+    print(f"\nRSS {rss_before:.1f} MB -> {rss_after:.1f} MB over {turns} turns "
+          f"({(rss_after - rss_before) * 1000 / turns:.0f} KB/turn)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--first-token", type=float, default=0.2, help="artificial time to first delta, seconds")
+    parser.add_argument("--chunk-chars", type=int, default=8)
+    parser.add_argument("--chunk-interval", type=float, default=0.01, help="seconds between streamed chunks")
+    parser.add_argument("--auto-approve", action="store_true",
+                        help="let the approval policy run read-only commands without a click")
+    parser.add_argument("--script", help="replay script (JSON list of entries) instead of the built-in one")
+    args = parser.parse_args()
+    write_config(args)
+    try:
+        asyncio.run(run(args.turns))
+    finally:
+        shutil.rmtree(_home, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark: streamed chat latency of configured models, side by side.
+
+Sends the same prompt to each model named on the command line (entries of config.json,
+e.g. an Azure deployment and the same model on OpenAI) and reports time to first delta,
+total time and streamed characters per second. Runs alternate between models so a
+slow minute of network affects them equally.
+
+    python benchmarks/bench_providers.py gpt4o-azure gpt4o-openai [--runs 5] [--prompt "..."]
+
+This talks to the real APIs and uses your quota.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from termixai.model_factory import ModelFactory
+
+PROMPT = "In three sentences, what does the `df -h` command report?"
+
+
+async def measure(model, prompt: str) -> tuple:
+    started = time.perf_counter()
+    first = None
+    chars = 0
+    async for delta in await model.chat(prompt=prompt, memory=[], stream=True):
+        if first is None:
+            first = time.perf_counter() - started
+        chars += len(delta.content or "")
+    return first or 0.0, time.perf_counter() - started, chars
+
+
+def p95(samples: list) -> float:
+    return statistics.quantiles(samples, n=20, method="inclusive")[-1] if len(samples) > 1 else samples[0]
+
+
+async def run(names: list, runs: int, prompt: str) -> None:
+    models = {name: await ModelFactory.create(name) for name in names}
+    results = {name: [] for name in names}
+    try:
+        for _ in range(runs):
+            for name, model in models.items():
+                results[name].append(await measure(model, prompt))
+    finally:
+        await ModelFactory.close_all()
+
+    print(f"{'model':<20}{'provider':<10}{'ttft p50':>10}{'ttft p95':>10}{'total p50':>11}{'chars/s':>10}")
+    for name, samples in results.items():
+        ttft = [first for first, _, _ in samples]
+        total = [elapsed for _, elapsed, _ in samples]
+        rate = sum(chars for _, _, chars in samples) / sum(total)
+        print(
+            f"{name:<20}{models[name].provider:<10}{statistics.median(ttft) * 1000:>9.0f}ms"
+            f"{p95(ttft) * 1000:>8.0f}ms{statistics.median(total) * 1000:>9.0f}ms{rate:>10.0f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("models", nargs="+", help="model names from config.json")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--prompt", default=PROMPT)
+    args = parser.parse_args()
+    asyncio.run(run(args.models, args.runs, args.prompt))
+
+
+if __name__ == "__main__":
+    main()
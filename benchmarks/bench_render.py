@@ -0,0 +1,130 @@
+"""Benchmark: rendering a streamed 20 KB response into the Response widget.
+
+Compares the old strategy (re-render the whole document with `update` on every chunk)
+against RenderCoalescer (buffered `append` at a capped frame rate).
+
+    python benchmarks/bench_render.py [--size 20000] [--chunk 4] [--rate 500] [--fps 30]
+
+Reports CPU time for the whole run, wall time until the final text is on screen,
+and the p50/max delay between a chunk being produced and it reaching the widget.
+The per-chunk baseline is quadratic in the response size, so compare the two
+strategies on a smaller response, e.g. `--strategy both --size 4000`.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from textual.app import App
+from textual.containers import VerticalScroll
+
+from termixai.inface import Response
+from termixai.render import RenderCoalescer
+
+PARAGRAPH = (
+    "The disk `/dev/sda1` is **82% full**. The largest directories are `/var/log` and "
+    "`/home`, which together account for most of the usage.\n\n"
+    "- `/var/log/journal` holds 3.1G of archived logs\n"
+    "- `/home/user/.cache` holds 1.4G of build artifacts\n\n"
+)
+
+
+def build_response(size: int) -> str:
+    text = ""
+    while len(text) < size:
+        text += PARAGRAPH
+    return text[:size]
+
+
+class BenchApp(App):
+    def compose(self):
+        with VerticalScroll(id="chat-view"):
+            yield Response(id="resp")
+
+
+async def run(strategy: str, text: str, chunk: int, rate: int, fps: int) -> dict:
+    app = BenchApp()
+    chunks = [text[i:i + chunk] for i in range(0, len(text), chunk)]
+    latencies = []
+    async with app.run_test() as pilot:
+        resp = app.query_one("#resp", Response)
+        produced_at = []
+        cursor = {"index": 0}
+
+        def observe():
+            ## sample how much text the widget has actually been given so far
+            length = len(resp.source)
+            now = time.perf_counter()
+            index = cursor["index"]
+            while index < len(produced_at) and produced_at[index][0] <= length:
+                latencies.append(now - produced_at[index][1])
+                index += 1
+            cursor["index"] = index
+
+        observer = app.set_interval(1 / 240, observe)
+
+        async def produce():
+            ## deltas arrive on the event loop, as from the turn worker
+            collected = ""
+            renderer = None
+            if strategy == "coalesced":
+                renderer = RenderCoalescer(resp, max_fps=fps)
+                renderer.start()
+            delay = 1 / rate if rate else 0
+            for part in chunks:
+                await asyncio.sleep(delay)  # simulated token arrival
+                collected += part
+                produced_at.append((len(collected), time.perf_counter()))
+                if renderer is not None:
+                    renderer.feed(part)
+                else:
+                    await resp.update(collected)
+            if renderer is not None:
+                await renderer.close()
+
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        await produce()
+        while len(resp.source) < len(text):
+            await pilot.pause(0.01)
+        await pilot.pause()
+        observe()
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        observer.stop()
+        assert resp.source == text, "rendered text does not match the response"
+
+    return {
+        "strategy": strategy,
+        "cpu_s": cpu,
+        "wall_s": wall,
+        "p50_latency_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "max_latency_ms": max(latencies) * 1000 if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=20_000, help="response size in characters")
+    parser.add_argument("--chunk", type=int, default=4, help="characters per streamed delta")
+    parser.add_argument("--rate", type=int, default=500, help="deltas per second, 0 for unpaced")
+    parser.add_argument("--fps", type=int, default=30, help="coalescer frame rate cap")
+    parser.add_argument(
+        "--strategy", choices=["per-chunk", "coalesced", "both"], default="coalesced"
+    )
+    args = parser.parse_args()
+
+    text = build_response(args.size)
+    strategies = ["per-chunk", "coalesced"] if args.strategy == "both" else [args.strategy]
+    print(f"{len(text)} chars in {-(-len(text) // args.chunk)} chunks")
+    print(f"{'strategy':<12}{'cpu s':>10}{'wall s':>10}{'p50 ms':>10}{'max ms':>10}")
+    for strategy in strategies:
+        result = asyncio.run(run(strategy, text, args.chunk, args.rate, args.fps))
+        print(
+            f"{result['strategy']:<12}{result['cpu_s']:>10.2f}{result['wall_s']:>10.2f}"
+            f"{result['p50_latency_ms']:>10.1f}{result['max_latency_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
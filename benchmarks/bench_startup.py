@@ -0,0 +1,74 @@
+"""Benchmark: cold-start time of each termixai subcommand.
+
+Runs every command in a fresh interpreter with `python -X importtime`, in a throwaway
+HOME so no real config or history is touched, and reports the wall time, the total
+time spent importing, and the heaviest top-level imports.
+
+    python benchmarks/bench_startup.py [--runs 5] [--top 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+COMMANDS = {
+    "--help": ["-m", "termixai.cli", "--help"],
+    "config --help": ["-m", "termixai.cli", "config", "--help"],
+    "history list": ["-m", "termixai.cli", "history", "list"],
+    "cache stats": ["-m", "termixai.cli", "cache", "stats"],
+    "chat (UI import)": ["-c", "import termixai.cli, termixai.inface"],
+}
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Cumulative microseconds per top-level module, from `-X importtime` output."""
+    top_level = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        if name.startswith("  "):
+            continue  # nested import, already counted by its parent
+        top_level[name.strip()] = int(cumulative_us)
+    return top_level
+
+
+def measure(argv: list, env: dict) -> tuple:
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        env=env, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - started
+    return wall, parse_importtime(completed.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="runs per command, the median is reported")
+    parser.add_argument("--top", type=int, default=5, help="heaviest imports to list per command")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, HOME=home, XDG_CONFIG_HOME=os.path.join(home, ".config"),
+                   XDG_CACHE_HOME=os.path.join(home, ".cache"))
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), env.get("PYTHONPATH")]))
+        print(f"{'command':<20}{'wall ms':>10}{'imports ms':>12}  heaviest imports")
+        for label, argv in COMMANDS.items():
+            walls, imports = [], []
+            for _ in range(args.runs):
+                wall, modules = measure(argv, env)
+                walls.append(wall)
+                imports.append(modules)
+            last = imports[-1]
+            total_ms = statistics.median(sum(run.values()) for run in imports) / 1000
+            heaviest = sorted(last.items(), key=lambda item: item[1], reverse=True)[:args.top]
+            heaviest = ", ".join(f"{name} {us / 1000:.0f}" for name, us in heaviest)
+            print(f"{label:<20}{statistics.median(walls) * 1000:>10.0f}{total_ms:>12.0f}  {heaviest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Benchmark: native tools against the shell commands they replace.
+
+Runs each native probe in-process and its usual shell equivalent through ShellCommand
+(fork/exec of `sh -c`, pipes, wait), and reports the median time and the estimated
+tokens of the output that would be sent back to the model.
+
+    python benchmarks/bench_tools.py [--runs 50]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from termixai.executor import ShellCommand
+from termixai.models.stream import ToolCall
+from termixai.tools import tool_registry
+from termixai.utils.compaction import estimate_tokens
+
+## native call and the command a model would otherwise run for it
+PAIRS = [
+    (("read_file", {"path": "/etc/services", "max_lines": 50}), "head -n 50 /etc/services"),
+    (("list_dir", {"path": "/etc"}), "ls -la /etc"),
+    (("disk_usage", {}), "df -h"),
+    (("process_list", {"limit": 20}), "ps aux --sort=-rss | head -n 21"),
+    (("listening_ports", {}), "ss -tulpn"),
+]
+
+
+async def median_ms(run, runs: int) -> tuple:
+    timings = []
+    output = ""
+    for _ in range(runs):
+        started = time.perf_counter()
+        output = await run()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), output
+
+
+async def main(runs: int) -> None:
+    print(f"{'tool':<18}{'native ms':>10}{'tokens':>8}   {'shell':<32}{'shell ms':>9}{'tokens':>8}")
+    for (name, arguments), command in PAIRS:
+        invocation = tool_registry.invocation(ToolCall("bench", name, json.dumps(arguments)))
+
+        async def native():
+            return (await invocation.run()).to_tool_output()
+
+        async def shell():
+            return (await ShellCommand(command).run()).to_tool_output()
+
+        native_ms, native_output = await median_ms(native, runs)
+        shell_ms, shell_output = await median_ms(shell, runs)
+        print(f"{name:<18}{native_ms:>10.2f}{estimate_tokens(native_output):>8}   "
+              f"{command:<32}{shell_ms:>9.2f}{estimate_tokens(shell_output):>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=50)
+    asyncio.run(main(parser.parse_args().runs))
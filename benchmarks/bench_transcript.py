@@ -0,0 +1,96 @@
+"""Benchmark: append and scroll latency of the chat view as a session grows.
+
+Mounts alternating Prompt/Response messages into either the virtualized Transcript
+or a plain VerticalScroll, and samples the cost of appending one more message and of
+jumping to the top and back at each checkpoint, along with process RSS.
+
+    python benchmarks/bench_transcript.py [--messages 1000] [--view transcript|plain|both]
+
+The plain view gets slower with every message, so a full `both` run takes a while.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from textual.app import App
+from textual.containers import VerticalScroll
+
+from termixai.inface import Prompt, Response
+from termixai.transcript import Transcript
+
+ANSWER = (
+    "Port **8080** is used by `java` (pid 4121), started by the `tomcat` user.\n\n"
+    "- listening on `0.0.0.0:8080`\n"
+    "- 12 established connections\n"
+)
+
+
+class BenchApp(App):
+    def __init__(self, view: str):
+        super().__init__()
+        self.view = view
+
+    def compose(self):
+        if self.view == "transcript":
+            yield Transcript(id="chat-view")
+        else:
+            yield VerticalScroll(id="chat-view")
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+async def settle(pilot) -> None:
+    await pilot.pause()
+    await pilot.pause()
+
+
+def report(view, messages, mounted, append_ms, scroll_ms, rss) -> None:
+    print(f"{view:<12}{messages:>10}{mounted:>10}{append_ms:>12.1f}{scroll_ms:>12.1f}{rss:>10.1f}", flush=True)
+
+
+async def run(view: str, total: int, checkpoints: list) -> None:
+    app = BenchApp(view)
+    async with app.run_test(size=(120, 40)) as pilot:
+        chat_view = app.query_one("#chat-view")
+        chat_view.anchor()
+        for index in range(total):
+            message = Prompt(f"what is using port {index}?") if index % 2 == 0 else Response(ANSWER)
+            if index + 1 not in checkpoints:
+                await chat_view.mount(message)
+                if index % 50 == 0:
+                    await settle(pilot)
+                continue
+            await settle(pilot)
+            started = time.perf_counter()
+            await chat_view.mount(message)
+            await settle(pilot)
+            append_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            chat_view.scroll_home(animate=False)
+            await settle(pilot)
+            chat_view.scroll_end(animate=False)
+            await settle(pilot)
+            scroll_ms = (time.perf_counter() - started) * 1000
+            report(view, index + 1, len(chat_view.children), append_ms, scroll_ms, rss_mb())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--view", choices=["transcript", "plain", "both"], default="both")
+    args = parser.parse_args()
+
+    checkpoints = [count for count in (100, 250, 500, 1000, 1500, 2000) if count <= args.messages]
+    views = ["plain", "transcript"] if args.view == "both" else [args.view]
+    print(f"{'view':<12}{'messages':>10}{'mounted':>10}{'append ms':>12}{'scroll ms':>12}{'rss MB':>10}")
+    for view in views:
+        asyncio.run(run(view, args.messages, checkpoints))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+import asyncio
+import json
+import re
+import sys
+import time
+
+from termixai.client import print_outcome
+from termixai.command_cache import UNSAFE_CHARS, command_cache
+from termixai.executor import ToolScheduler
+from termixai.model_factory import ModelFactory
+from termixai.models.scheduler import BATCH, request_priority
+from termixai.models.stream import ToolCallAccumulator
+from termixai.policy import command_policy
+from termixai.tools import Invocation, ToolArgumentError, tool_registry
+from termixai.tracing import tracer
+from termixai.utils.config import get_setting, load_config
+
+NOT_APPROVED = "This command was not run: it is not on the auto-approve allowlist of this headless run."
+
+
+class AutoApprove:
+    """Allowlist deciding which commands a headless run may execute without a human.
+
+    Patterns are regular expressions that must match the whole (whitespace-normalized)
+    command. Commands that chain, redirect or substitute are never matched by them. With
+    `read_only`, whatever the interactive approval policy auto-approves is allowed too,
+    including the native read-only tools.
+    """
+
+    def __init__(self, patterns: list = None, read_only: bool = False):
+        patterns = list(patterns or []) + get_setting("batch", "allowlist", [])
+        self.patterns = [re.compile(pattern) for pattern in patterns]
+        self.read_only = read_only
+
+    def allows(self, command: str) -> bool:
+        if self.read_only and command_policy.allows(command):
+            return True
+        command = command_cache.normalize(command)
+        if UNSAFE_CHARS.search(command):
+            return False
+        return any(pattern.fullmatch(command) for pattern in self.patterns)
+
+    def allows_call(self, invocation: Invocation) -> bool:
+        if not invocation.native:
+            return self.allows(invocation.command)
+        if self.read_only and command_policy.check_tool(invocation.command) is None:
+            return True
+        return any(pattern.fullmatch(invocation.command) for pattern in self.patterns)
+
+
+async def collect(deltas, on_text=None) -> tuple:
+    """Drain a delta stream into (text, tool_calls)."""
+    text = []
+    tool_calls = ToolCallAccumulator()
+    async for delta in deltas:
+        if delta.tool_calls:
+            tool_calls.add(delta.tool_calls)
+        if delta.content:
+            text.append(delta.content)
+            if on_text is not None:
+                on_text(delta.content)
+    return "".join(text), tool_calls.result() if tool_calls else []
+
+
+async def run_tool(model, tool_scheduler: ToolScheduler, invocation: Invocation, cwd: str = None):
+    command = invocation.command
+    with tracer.span("command", command=command, native=invocation.native) as command_span:
+        if invocation.native:
+            result = await invocation.run()
+        else:
+            result = await model.run_shell_process(model.create_shell_process(command, cwd=cwd), tool_scheduler)
+        command_span.set(exit_code=result.exit_code, output_bytes=len(result.output.encode()), cached=result.cached)
+    return result
+
+
+async def run_prompt(model, prompt: str, policy: AutoApprove, tool_scheduler: ToolScheduler, on_text=None,
+                     cwd: str = None) -> dict:
+    """Answer one prompt headlessly: model turn, allowed commands, follow-up turn.
+
+    Commands run in `cwd`, or the current directory when it is None.
+    """
+    started = time.monotonic()
+    outcome = {"prompt": prompt, "model": model.deployment_name, "answer": "", "commands": []}
+    with tracer.span("turn", model=model.deployment_name, headless=True) as turn_span:
+        with tracer.span("chat"):
+            text, tool_calls = await collect(await model.chat(prompt=prompt, memory=[], stream=True), on_text)
+        if tool_calls:
+            tool_data = {}
+            pending = {}
+            for tool_call in tool_calls:
+                try:
+                    invocation = tool_registry.invocation(tool_call, cwd)
+                except ToolArgumentError as error:
+                    tool_data[tool_call.id] = f"This call was not run: {error}."
+                    outcome["commands"].append({"command": tool_call.name, "approved": False, "error": str(error)})
+                    continue
+                if policy.allows_call(invocation):
+                    if not invocation.native:
+                        command_policy.note_approved(invocation.command)
+                    pending[tool_call.id] = asyncio.create_task(run_tool(model, tool_scheduler, invocation, cwd))
+                else:
+                    tool_data[tool_call.id] = NOT_APPROVED
+                    outcome["commands"].append({"command": invocation.command, "approved": False})
+            for tool_id, task in pending.items():
+                result = await task
+                tool_data[tool_id] = result.to_tool_output()
+                outcome["commands"].append({"approved": True, "status": result.status(), "output": result.output,
+                                            **result.to_dict()})
+            with tracer.span("tool_followup"):
+                tool_messages = await model.create_tool_msg(tool_data)
+                deltas = await model.send_tool_msg(prompt, tool_messages, tool_calls, memory=[], stream=True)
+                text, _ = await collect(deltas, on_text)
+        turn_span.set(tool_calls=len(tool_calls))
+    outcome["answer"] = text.strip()
+    outcome["duration"] = round(time.monotonic() - started, 3)
+    return outcome
+
+
+def default_model_name() -> str:
+    models = list(load_config()["models"].keys())
+    if not models:
+        raise SystemExit("No models configured. Run `termixai config` first.")
+    return get_setting("batch", "model", models[0])
+
+
+def read_prompts(path: str) -> list:
+    """Prompts from a JSONL file (or - for stdin): {"prompt": ..., "id": ...} objects or plain lines."""
+    stream = sys.stdin if path == "-" else open(path)
+    prompts = []
+    with stream:
+        for number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                entry = line
+            if not isinstance(entry, dict):
+                ## a line like `42` or `[1]` parses as JSON but is meant as text
+                entry = {"prompt": entry if isinstance(entry, str) else line}
+            if not isinstance(entry.get("prompt"), str):
+                raise SystemExit(f"{path}, line {number}: an object line needs a \"prompt\" string")
+            entry.setdefault("id", number)
+            prompts.append(entry)
+    return prompts
+
+
+async def ask(prompt: str, model_name: str, policy: AutoApprove, as_json: bool = False) -> int:
+    model = await ModelFactory.create(model_name)
+    try:
+        on_text = None if as_json else lambda text: print(text, end="", flush=True)
+        outcome = await run_prompt(model, prompt, policy, ToolScheduler(), on_text=on_text)
+    finally:
+        await ModelFactory.close_all()
+        await asyncio.to_thread(tracer.close)
+    print_outcome(outcome, as_json)
+    return 0
+
+
+async def batch(prompts: list, model_name: str, policy: AutoApprove, concurrency: int) -> int:
+    """Run prompts concurrently and print one JSON result per line as each finishes."""
+    ## batch requests queue behind any interactive session sharing the rate limits
+    request_priority.set(BATCH)
+    model = await ModelFactory.create(model_name)
+    tool_scheduler = ToolScheduler()
+    slots = asyncio.Semaphore(concurrency)
+    failures = 0
+
+    async def worker(entry: dict) -> dict:
+        async with slots:
+            try:
+                outcome = await run_prompt(model, entry["prompt"], policy, tool_scheduler)
+            except Exception as error:
+                outcome = {"prompt": entry["prompt"], "model": model_name, "error": f"{type(error).__name__}: {error}"}
+        outcome["id"] = entry["id"]
+        return outcome
+
+    try:
+        for finished in asyncio.as_completed([worker(entry) for entry in prompts]):
+            outcome = await finished
+            failures += "error" in outcome
+            print(json.dumps(outcome), flush=True)
+    finally:
+        await ModelFactory.close_all()
+        await asyncio.to_thread(tracer.close)
+    return 1 if failures else 0
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from contextlib import closing
+
+from termixai.models.stream import StreamDelta, ToolCall, ToolCallDelta
+from termixai.utils.config import CACHE_DIR, get_setting
+
+CACHE_FILE = os.path.join(CACHE_DIR, "responses.db")
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 500
+DEFAULT_CONTEXT_MESSAGES = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used);
+"""
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Case, spacing and trailing punctuation do not change what is being asked."""
+    return re.sub(r"\s+", " ", prompt).strip().lower().rstrip("?!. ")
+
+
+class ResponseCache:
+    """On-disk LRU + TTL cache of model turns.
+
+    An entry is either the tool calls the model planned for a prompt (which still go
+    through approval and are re-run on replay) or the final answer text. Keys combine
+    the deployment, the normalized prompt and a hash of the most recent memory messages.
+    """
+
+    def __init__(self, path: str = CACHE_FILE):
+        self.path = path
+        self.enabled = get_setting("response_cache", "enabled", True)
+        self.ttl = get_setting("response_cache", "ttl", DEFAULT_TTL)
+        self.max_entries = get_setting("response_cache", "max_entries", DEFAULT_MAX_ENTRIES)
+        self.context_messages = get_setting("response_cache", "context_messages", DEFAULT_CONTEXT_MESSAGES)
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with closing(sqlite3.connect(self.path)) as db:
+            db.executescript(SCHEMA)
+
+    def key(self, model: str, prompt: str, memory: list) -> str:
+        relevant = memory[-self.context_messages:] if self.context_messages else []
+        context = json.dumps(relevant, sort_keys=True, default=str)
+        raw = "\x1f".join([model, normalize_prompt(prompt), hashlib.sha256(context.encode()).hexdigest()])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str):
+        """Return (kind, payload) for a live entry, counting the hit or miss."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with closing(sqlite3.connect(self.path)) as db, db:
+            row = db.execute("SELECT kind, payload, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[2] > self.ttl:
+                if row is not None:
+                    db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return row[0], json.loads(row[1])
+
+    def put(self, key: str, model: str, prompt: str, kind: str, payload) -> None:
+        if not self.enabled:
+            return
+        now = time.time()
+        with closing(sqlite3.connect(self.path)) as db, db:
+            db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, prompt, kind, json.dumps(payload), now, now),
+            )
+            db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+            ## least recently used entries go first once the cache is full
+            db.execute(
+                """DELETE FROM responses WHERE key IN (
+                       SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)""",
+                (self.max_entries,),
+            )
+
+    def put_turn(self, key: str, model: str, prompt: str, tool_calls: list, answer: str) -> None:
+        if tool_calls:
+            self.put(key, model, prompt, "tool_calls", [tool_call.to_dict() for tool_call in tool_calls])
+        elif answer:
+            self.put(key, model, prompt, "answer", answer)
+
+    def stats(self) -> dict:
+        with closing(sqlite3.connect(self.path)) as db:
+            entries = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def clear(self) -> None:
+        with closing(sqlite3.connect(self.path)) as db, db:
+            db.execute("DELETE FROM responses")
+
+
+async def replay(kind: str, payload):
+    """Turn a cached entry back into the same deltas a live stream would produce."""
+    if kind == "answer":
+        yield StreamDelta(content=payload, finish_reason="stop")
+        return
+    fragments = []
+    for index, call in enumerate(payload):
+        tool_call = ToolCall(call["id"], call["function"]["name"], call["function"]["arguments"])
+        fragments.append(ToolCallDelta(index=index, id=tool_call.id, name=tool_call.name, arguments=tool_call.arguments))
+    yield StreamDelta(tool_calls=fragments, finish_reason="tool_calls")
@@ -1,19 +1,14 @@
 import argparse
 import os
 import sys
-import asyncio
 import json
-from platformdirs import user_config_dir
-from termixai.inface import ChatUI
 import getpass
+from termixai.utils.config import CONFIG_FILE
 
-
-APP_NAME = "termixai"
-CONFIG_DIR = user_config_dir(APP_NAME)
-os.makedirs(CONFIG_DIR, exist_ok=True)
+## heavy modules (Textual, provider SDKs) are imported inside the subcommand that needs them
 
 def setup_model_config():
-    CONFIG_PATH = os.path.join(CONFIG_DIR, "config.json")
+    CONFIG_PATH = CONFIG_FILE
     if os.path.exists(CONFIG_PATH):
         print("Config file already exists.")
     else:
@@ -59,7 +54,57 @@ def setup_model_config():
     print(f"Configuration saved to {CONFIG_PATH}")
 
 
+def show_history(args):
+    from datetime import datetime
+    from termixai.history import SessionStore
+
+    store = SessionStore()
+    if args.history_command == "search":
+        rows = store.search(" ".join(args.query), limit=args.limit)
+        if not rows:
+            print("No matches.")
+        for session_id, ts, kind, snippet in rows:
+            when = datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M")
+            snippet = " ".join((snippet or "").split())
+            print(f"{session_id}  {when}  {kind:<14} {snippet}")
+    else:
+        for session_id, started_at, model, events, first_prompt in store.sessions(limit=args.limit):
+            when = datetime.fromtimestamp(started_at).strftime("%Y-%m-%d %H:%M")
+            print(f"{session_id}  {when}  {model or '-':<16} {events:>4} events  {(first_prompt or '')[:60]}")
+    print("\nResume a session with: termixai chat --resume <id>")
+
+
+def manage_cache(args):
+    from termixai.cache import ResponseCache
+
+    cache = ResponseCache()
+    if args.cache_command == "clear":
+        cache.clear()
+        print("Response cache cleared.")
+    else:
+        stats = cache.stats()
+        print(f"{stats['entries']} cached responses in {cache.path}")
+
+
+def run_headless(args):
+    import asyncio
+    from termixai import batch
+
+    policy = batch.AutoApprove(args.allow, read_only=args.allow_read_only)
+    model_name = args.model or batch.default_model_name()
+    if args.command == "ask":
+        return asyncio.run(batch.ask(" ".join(args.prompt), model_name, policy, as_json=args.json))
+    return asyncio.run(batch.batch(batch.read_prompts(args.file), model_name, policy, args.concurrency))
+
+
 def main():
+    ## `ask` goes to a running daemon before the rest of the command line is even parsed
+    if sys.argv[1:2] == ["ask"]:
+        from termixai.client import forward
+        code = forward(sys.argv[2:])
+        if code is not None:
+            sys.exit(code)
+
     parser = argparse.ArgumentParser(
         description="🧠 AI Shell Assistant - interact with your Linux system using natural language."
     )
@@ -70,15 +115,63 @@ def main():
     subparsers.add_parser("config", help="Configure your AI model provider")
 
     # chat command
-    subparsers.add_parser("chat", help="Start chat with AI")
-
+    chat_parser = subparsers.add_parser("chat", help="Start chat with AI")
+    chat_parser.add_argument("--resume", metavar="ID", help="Continue a saved session")
+
+    # history command
+    history_parser = subparsers.add_parser("history", help="Browse and search saved chat sessions")
+    history_subparsers = history_parser.add_subparsers(dest="history_command")
+    history_list = history_subparsers.add_parser("list", help="List recent sessions")
+    history_list.add_argument("--limit", type=int, default=20)
+    history_search = history_subparsers.add_parser("search", help="Full-text search across all sessions")
+    history_search.add_argument("query", nargs="+")
+    history_search.add_argument("--limit", type=int, default=20)
+
+
+    # headless commands: no approval UI, so commands only run if the allowlist permits them
+    headless = argparse.ArgumentParser(add_help=False)
+    headless.add_argument("--model", help="Model from config.json (default: batch.model or the first one)")
+    headless.add_argument("--allow", action="append", default=[], metavar="REGEX",
+                          help="Auto-approve commands fully matching REGEX (repeatable)")
+    headless.add_argument("--allow-read-only", action="store_true",
+                          help="Auto-approve what the approval policy considers read-only")
+    ask_parser = subparsers.add_parser("ask", parents=[headless], help="Ask one question without the chat UI")
+    ask_parser.add_argument("prompt", nargs="+")
+    ask_parser.add_argument("--json", action="store_true", help="Print the result as one JSON object")
+    ask_parser.add_argument("--no-daemon", action="store_true", help="Answer in this process even if a daemon runs")
+    batch_parser = subparsers.add_parser("batch", parents=[headless], help="Answer many prompts concurrently")
+    batch_parser.add_argument("file", help="JSONL file of {\"prompt\": ..., \"id\": ...} lines, or - for stdin")
+    batch_parser.add_argument("--concurrency", type=int, default=4)
+
+    # daemon command
+    daemon_parser = subparsers.add_parser("daemon", help="Keep models warm and answer `ask` over a local socket")
+    daemon_parser.add_argument("daemon_command", nargs="?", choices=["start", "status", "stop"], default="start")
+
+    # cache command
+    cache_parser = subparsers.add_parser("cache", help="Inspect or clear the response cache")
+    cache_parser.add_argument("cache_command", nargs="?", choices=["stats", "clear"], default="stats")
 
     args = parser.parse_args()
 
     if args.command == "config":
         setup_model_config()
     elif args.command == "chat":
-        ChatUI().run()
+        from termixai.inface import ChatUI
+        if args.resume:
+            from termixai.history import SessionStore
+            if not SessionStore().session_exists(args.resume):
+                print(f"No saved session with id {args.resume}.")
+                return
+        ChatUI(resume_session=args.resume).run()
+    elif args.command == "history":
+        show_history(args)
+    elif args.command == "cache":
+        manage_cache(args)
+    elif args.command == "daemon":
+        from termixai import daemon
+        sys.exit(daemon.run(args.daemon_command))
+    elif args.command in ("ask", "batch"):
+        sys.exit(run_headless(args))
     else:
         parser.print_help()
 
@@ -0,0 +1,131 @@
+import json
+import os
+import socket
+import sys
+
+## `termixai ask` is forwarded from here before argparse or any termixai module is imported,
+## so this module only uses what the interpreter has loaded anyway and a socket
+
+
+def socket_path() -> str:
+    """Where `termixai daemon` listens: $TERMIXAI_SOCKET, else a private runtime directory."""
+    path = os.environ.get("TERMIXAI_SOCKET")
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "termixai", "daemon.sock")
+    return os.path.join(f"/tmp/termixai-{os.getuid()}", "daemon.sock")
+
+
+def owned_by_user(path: str) -> bool:
+    """The socket's directory must belong to us, or someone else could be listening on it."""
+    try:
+        info = os.stat(os.path.dirname(path))
+    except OSError:
+        return False
+    return info.st_uid == os.getuid() and not info.st_mode & 0o022
+
+
+def connect(path: str = None):
+    """A socket connected to the daemon, or None when no daemon is running."""
+    path = path or socket_path()
+    if not owned_by_user(path):
+        return None
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path)
+    except OSError:
+        connection.close()
+        return None
+    return connection
+
+
+def parse_ask(argv: list):
+    """The arguments of `termixai ask` as a daemon request, or None to leave them to argparse."""
+    request = {"op": "ask", "model": None, "allow": [], "read_only": False, "json": False}
+    words = []
+    position = 0
+    while position < len(argv):
+        arg = argv[position]
+        if arg == "--":
+            words += argv[position + 1:]
+            break
+        name, _, value = arg.partition("=")
+        if name in ("--model", "--allow"):
+            if not value:
+                position += 1
+                if position == len(argv):
+                    return None
+                value = argv[position]
+            if name == "--model":
+                request["model"] = value
+            else:
+                request["allow"].append(value)
+        elif arg == "--allow-read-only":
+            request["read_only"] = True
+        elif arg == "--json":
+            request["json"] = True
+        elif arg.startswith("-") and arg != "-":
+            ## --help, --no-daemon or anything unknown goes through the full command line parser
+            return None
+        else:
+            words.append(arg)
+        position += 1
+    if not words:
+        return None
+    request["prompt"] = " ".join(words)
+    request["cwd"] = os.getcwd()
+    return request
+
+
+def print_outcome(outcome: dict, as_json: bool) -> None:
+    """Final output of `termixai ask`, after the answer was streamed (unless as_json)."""
+    if as_json:
+        print(json.dumps(outcome))
+        return
+    print()
+    for command in outcome["commands"]:
+        state = command["status"] if command["approved"] else "not approved"
+        print(f"[{state}] {command['command']}", file=sys.stderr)
+
+
+def request(connection, message: dict):
+    """Send one request and yield the daemon's replies, one dict per line."""
+    connection.sendall(json.dumps(message).encode() + b"\n")
+    with connection.makefile("r", encoding="utf-8") as replies:
+        for line in replies:
+            yield json.loads(line)
+
+
+def forward(argv: list):
+    """Answer `termixai ask` through a running daemon.
+
+    Returns the exit code, or None when there is no daemon or the arguments need the
+    full parser, so the caller falls back to answering in this process.
+    """
+    message = parse_ask(argv)
+    if message is None:
+        return None
+    connection = connect()
+    if connection is None:
+        return None
+    try:
+        for reply in request(connection, message):
+            if "text" in reply:
+                if not message["json"]:
+                    sys.stdout.write(reply["text"])
+                    sys.stdout.flush()
+            elif "done" in reply:
+                print_outcome(reply["done"], message["json"])
+                return 0
+            elif "error" in reply:
+                print(f"termixai daemon: {reply['error']}", file=sys.stderr)
+                return 1
+        print("termixai daemon: connection closed before the answer was complete", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        ## closing the connection cancels the request in the daemon
+        return 130
+    finally:
+        connection.close()
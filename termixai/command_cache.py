@@ -0,0 +1,95 @@
+import copy
+import re
+import time
+
+from termixai.utils.config import get_setting
+
+## read-only probes whose output is worth reusing for a while, with TTLs in seconds
+DEFAULT_RULES = [
+    {"pattern": r"uname( -[a-z]+)*", "ttl": 3600},
+    {"pattern": r"cat /etc/(os-release|lsb-release|issue|hostname)", "ttl": 3600},
+    {"pattern": r"(hostname|whoami|id|nproc|arch|lscpu)( -[a-zA-Z]+)*", "ttl": 3600},
+    {"pattern": r"lsblk( -[a-zA-Z]+)*", "ttl": 60},
+    {"pattern": r"df( -[a-zA-Z]+)*( [\w/.-]+)*", "ttl": 30},
+    {"pattern": r"du( -[a-zA-Z]+)* [\w/.~-]+", "ttl": 30},
+    {"pattern": r"free( -[a-z]+)*", "ttl": 10},
+    {"pattern": r"(ip (-[a-z0-9]+ )*(addr|route|link)( show)?|ifconfig)", "ttl": 30},
+    {"pattern": r"uptime( -[a-z]+)*", "ttl": 5},
+]
+
+## anything that could chain, redirect or substitute makes a command not cacheable
+UNSAFE_CHARS = re.compile(r"[;&|<>`$()\n]")
+
+
+class CommandCache:
+    """TTL cache of results for read-only diagnostic commands.
+
+    Only commands fully matched by one of the configured rules are cached, each with the
+    rule's TTL. Approving a command the approval policy does not consider read-only
+    clears the cache (CommandPolicy.note_approved), since it may have changed what the
+    probes would report. Commands run in another directory
+    than this process (for daemon clients) are cached separately per directory.
+    """
+
+    def __init__(self):
+        self._rules = None
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _load_rules(self) -> list:
+        if self._rules is None:
+            if not get_setting("command_cache", "enabled", True):
+                self._rules = []
+            else:
+                rules = get_setting("command_cache", "rules", DEFAULT_RULES)
+                self._rules = [(re.compile(rule["pattern"]), rule["ttl"]) for rule in rules]
+        return self._rules
+
+    @staticmethod
+    def normalize(command: str) -> str:
+        return " ".join(command.split())
+
+    def ttl_for(self, command: str):
+        """TTL if `command` is a cacheable read-only probe, else None."""
+        command = self.normalize(command)
+        if UNSAFE_CHARS.search(command):
+            return None
+        for pattern, ttl in self._load_rules():
+            if pattern.fullmatch(command):
+                return ttl
+        return None
+
+    def is_read_only(self, command: str) -> bool:
+        return self.ttl_for(command) is not None
+
+    def _key(self, command: str, cwd: str = None) -> str:
+        command = self.normalize(command)
+        return command if cwd is None else f"{cwd}\0{command}"
+
+    def get(self, command: str, cwd: str = None):
+        """Cached CommandResult (marked as cached) or None."""
+        key = self._key(command, cwd)
+        entry = self._entries.get(key)
+        if entry is None or entry[1] < time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self.hits += 1
+        result = copy.copy(entry[0])
+        result.cached = True
+        result.age = time.monotonic() - entry[2]
+        return result
+
+    def put(self, command: str, result, cwd: str = None) -> None:
+        ttl = self.ttl_for(command)
+        if ttl is None or result.exit_code != 0 or result.truncated or result.timed_out or result.killed:
+            return
+        now = time.monotonic()
+        self._entries[self._key(command, cwd)] = (result, now + ttl, now)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+command_cache = CommandCache()
@@ -0,0 +1,176 @@
+import asyncio
+import json
+import logging
+import os
+import signal
+import time
+
+from termixai import batch
+from termixai.client import connect, owned_by_user, request, socket_path
+from termixai.executor import ToolScheduler
+from termixai.host_context import host_context
+from termixai.model_factory import ModelFactory
+from termixai.tracing import tracer
+from termixai.utils.config import get_setting
+
+
+class Daemon:
+    """Answers `termixai ask` for thin clients over a Unix domain socket.
+
+    A plain `termixai ask` pays for the interpreter, the provider SDK imports, config
+    parsing and a new TLS connection before its request goes out. The daemon pays that
+    once: models come from ModelFactory and keep their clients and pooled connections,
+    and the host context, command cache and tool slots are shared by every request.
+
+    Each connection carries one JSON request line and gets JSON lines back: `text`
+    chunks as they stream, then `done` with the outcome or `error`. A client that hangs
+    up cancels its request. The socket is only reachable by the user who started it.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or socket_path()
+        self.tool_scheduler = ToolScheduler()
+        self.started = time.time()
+        self.requests = 0
+        self.active = 0
+        self._server = None
+        self._stopping = None
+
+    async def warm(self) -> None:
+        """Collect the host context and build the configured models before the first request."""
+        await host_context.refresh()
+        for model_name in get_setting("daemon", "models", [batch.default_model_name()]):
+            try:
+                await ModelFactory.create(model_name)
+            except Exception as error:
+                logging.warning(f"Could not prepare model {model_name}: {error}")
+
+    def _prepare_socket(self) -> None:
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if not owned_by_user(self.path):
+            raise SystemExit(f"{directory} is not a private directory of this user; set TERMIXAI_SOCKET elsewhere.")
+        if os.path.exists(self.path):
+            connection = connect(self.path)
+            if connection is not None:
+                connection.close()
+                raise SystemExit(f"A daemon is already listening on {self.path}.")
+            ## left behind by a daemon that did not shut down cleanly
+            os.unlink(self.path)
+
+    async def serve(self) -> None:
+        self._prepare_socket()
+        await self.warm()
+        self._stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self._stopping.set)
+        old_umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(self.handle, path=self.path)
+        finally:
+            os.umask(old_umask)
+        logging.info(f"termixai daemon listening on {self.path}")
+        print(f"termixai daemon listening on {self.path} (pid {os.getpid()})", flush=True)
+        try:
+            await self._stopping.wait()
+        finally:
+            self._server.close()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+            await ModelFactory.close_all()
+            await asyncio.to_thread(tracer.close)
+
+    async def handle(self, reader, writer) -> None:
+        def send(reply: dict) -> None:
+            writer.write(json.dumps(reply).encode() + b"\n")
+
+        try:
+            message = json.loads(await reader.readline() or "{}")
+            op = message.get("op")
+            if op == "ask":
+                await self.ask(message, reader, send)
+            elif op == "status":
+                send(self.status())
+            elif op == "stop":
+                send({"stopping": True})
+                self._stopping.set()
+            else:
+                send({"error": f"unknown request {op!r}"})
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as error:
+            logging.warning(f"Daemon request failed: {error}")
+            send({"error": f"{type(error).__name__}: {error}"})
+        finally:
+            writer.close()
+
+    async def ask(self, message: dict, reader, send) -> None:
+        self.requests += 1
+        self.active += 1
+        try:
+            model = await ModelFactory.create(message.get("model") or batch.default_model_name())
+            policy = batch.AutoApprove(message.get("allow"), read_only=message.get("read_only", False))
+            prompt = message["prompt"]
+            cwd = message.get("cwd")
+            if cwd and cwd != os.getcwd():
+                ## the system prompt names the daemon's directory; commands run in the client's
+                prompt = f"(My working directory is {cwd}.)\n{prompt}"
+            answer = asyncio.create_task(batch.run_prompt(
+                model, prompt, policy, self.tool_scheduler,
+                on_text=lambda text: send({"text": text}), cwd=cwd,
+            ))
+            ## nothing else is read from a client, so end of input means it hung up
+            hangup = asyncio.create_task(reader.read(1))
+            await asyncio.wait({answer, hangup}, return_when=asyncio.FIRST_COMPLETED)
+            if not answer.done():
+                answer.cancel()
+                await asyncio.gather(answer, return_exceptions=True)
+                logging.info("Daemon client hung up, request cancelled")
+                return
+            hangup.cancel()
+            outcome = answer.result()
+            outcome["prompt"] = message["prompt"]
+            send({"done": outcome})
+        finally:
+            self.active -= 1
+
+    def status(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "socket": self.path,
+            "uptime": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "active": self.active,
+            "models": sorted(ModelFactory._instances),
+        }
+
+
+def control(command: str) -> int:
+    """`termixai daemon status|stop` against the running daemon."""
+    connection = connect()
+    if connection is None:
+        print(f"No daemon is listening on {socket_path()}.")
+        return 1
+    try:
+        reply = next(request(connection, {"op": command}), {})
+    finally:
+        connection.close()
+    if command == "stop":
+        print("Daemon stopping.")
+    else:
+        print(f"pid {reply['pid']}, up {reply['uptime']:.0f}s, {reply['requests']} requests "
+              f"({reply['active']} active), models: {', '.join(reply['models']) or '-'}")
+        print(f"socket: {reply['socket']}")
+    return 0
+
+
+def run(command: str = "start") -> int:
+    if command != "start":
+        return control(command)
+    logging.basicConfig(level="INFO", format="%(asctime)s %(levelname)s %(message)s")
+    asyncio.run(Daemon().serve())
+    return 0
@@ -0,0 +1,189 @@
+import asyncio
+import codecs
+import os
+import signal
+import time
+
+from termixai.utils.config import get_setting
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_MAX_OUTPUT_BYTES = 64 * 1024
+DEFAULT_MAX_CONCURRENT = 4
+READ_CHUNK = 4096
+
+
+class CommandResult:
+    """Outcome of a finished shell command."""
+
+    def __init__(self, command: str, exit_code, output: str, duration: float,
+                 truncated: bool = False, timed_out: bool = False, killed: bool = False):
+        self.command = command
+        self.exit_code = exit_code
+        self.output = output
+        self.duration = duration
+        self.truncated = truncated
+        self.timed_out = timed_out
+        self.killed = killed
+        self.cached = False
+        self.age = 0.0
+
+    def status(self) -> str:
+        """One-line status, shown in the chat view and appended to the tool output."""
+        if self.timed_out:
+            state = "timed out"
+        elif self.killed:
+            state = "killed by user"
+        else:
+            state = f"exit code {self.exit_code}"
+        parts = [state, f"{self.duration:.2f}s"]
+        if self.truncated:
+            parts.append("output truncated")
+        if self.cached:
+            parts.append(f"cached result from {self.age:.0f}s ago")
+        return ", ".join(parts)
+
+    def to_tool_output(self) -> str:
+        return f"{self.output}\n[{self.status()}]"
+
+    def to_dict(self) -> dict:
+        return {
+            "command": self.command,
+            "exit_code": self.exit_code,
+            "duration": self.duration,
+            "truncated": self.truncated,
+            "timed_out": self.timed_out,
+            "killed": self.killed,
+            "cached": self.cached,
+        }
+
+
+class ShellCommand:
+    """A shell command run with asyncio, with live output, limits and a kill switch.
+
+    The command runs in its own process group so `kill` also stops anything it spawned.
+    """
+
+    def __init__(self, command: str, timeout: float = None, max_output_bytes: int = None, cwd: str = None):
+        self.command = command
+        self.cwd = cwd
+        self.timeout = timeout if timeout is not None else get_setting("execution", "timeout", DEFAULT_TIMEOUT)
+        self.max_output_bytes = (
+            max_output_bytes if max_output_bytes is not None
+            else get_setting("execution", "max_output_bytes", DEFAULT_MAX_OUTPUT_BYTES)
+        )
+        self.process = None
+        self._output = []
+        self._output_bytes = 0
+        self._truncated = False
+        self._killed = False
+
+    async def run(self, on_output=None) -> CommandResult:
+        """Run the command to completion. `on_output(text)` is called for every chunk read."""
+        started = time.monotonic()
+        if self._killed:
+            ## killed while still waiting for a free slot
+            return CommandResult(self.command, None, "", 0.0, killed=True)
+        self.process = await asyncio.create_subprocess_shell(
+            self.command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            stdin=asyncio.subprocess.DEVNULL,
+            start_new_session=True,
+            cwd=self.cwd,
+        )
+        readers = asyncio.gather(
+            self._pump(self.process.stdout, on_output),
+            self._pump(self.process.stderr, on_output),
+        )
+        timed_out = False
+        try:
+            await asyncio.wait_for(asyncio.shield(readers), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            self._signal(signal.SIGKILL)
+            await readers
+        except asyncio.CancelledError:
+            self._signal(signal.SIGKILL)
+            raise
+        exit_code = await self.process.wait()
+        return CommandResult(
+            command=self.command,
+            exit_code=exit_code,
+            output="".join(self._output),
+            duration=time.monotonic() - started,
+            truncated=self._truncated,
+            timed_out=timed_out,
+            killed=self._killed,
+        )
+
+    def kill(self) -> None:
+        """Stop the command and everything it started."""
+        self._killed = True
+        self._signal(signal.SIGKILL)
+
+    def _signal(self, sig) -> None:
+        if self.process is None or self.process.returncode is not None:
+            return
+        try:
+            os.killpg(self.process.pid, sig)
+        except ProcessLookupError:
+            pass
+
+    async def _pump(self, stream, on_output) -> None:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        while True:
+            data = await stream.read(READ_CHUNK)
+            if not data:
+                break
+            if self._truncated:
+                continue  # keep draining so the process is not blocked on a full pipe
+            remaining = self.max_output_bytes - self._output_bytes
+            if len(data) > remaining:
+                data = data[:remaining]
+                self._truncated = True
+            self._output_bytes += len(data)
+            text = decoder.decode(data)
+            if text:
+                self._output.append(text)
+                if on_output is not None:
+                    on_output(text)
+            if self._truncated:
+                ## nothing more will be kept, so there is no point letting it run
+                self._signal(signal.SIGKILL)
+        tail = decoder.decode(b"", final=True)
+        if tail and not self._truncated:
+            self._output.append(tail)
+            if on_output is not None:
+                on_output(tail)
+
+
+class ToolScheduler:
+    """Runs approved tool commands concurrently, at most `max_concurrent` at a time.
+
+    Each command is handed over as soon as it is approved; commands beyond the cap
+    wait for a free slot instead of waiting for the whole batch of approvals.
+    """
+
+    def __init__(self, max_concurrent: int = None):
+        self.max_concurrent = (
+            max_concurrent if max_concurrent is not None
+            else get_setting("execution", "max_concurrent", DEFAULT_MAX_CONCURRENT)
+        )
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self.running = 0
+        self.queued = 0
+
+    async def run(self, shell: ShellCommand, on_output=None, on_start=None) -> CommandResult:
+        self.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+        self.running += 1
+        try:
+            if on_start is not None:
+                on_start()
+            return await shell.run(on_output=on_output)
+        finally:
+            self.running -= 1
+            self._slots.release()
@@ -0,0 +1,176 @@
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+
+from termixai.utils.config import CONFIG_DIR
+
+HISTORY_FILE = os.path.join(CONFIG_DIR, "history.db")
+FLUSH_INTERVAL = 0.5
+MAX_BATCH = 200
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL,
+    model TEXT
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    content TEXT,
+    meta TEXT
+);
+CREATE INDEX IF NOT EXISTS events_session ON events(session_id, id);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+    content, content='events', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN
+    INSERT INTO events_fts(rowid, content) VALUES (new.id, new.content);
+END;
+"""
+
+FTS_SEARCH = """
+SELECT e.session_id, e.ts, e.kind, snippet(events_fts, 0, '[', ']', '…', 12)
+FROM events_fts JOIN events e ON e.id = events_fts.rowid
+WHERE events_fts MATCH ? ORDER BY rank LIMIT ?
+"""
+
+
+class SessionStore:
+    """Append-only SQLite log of chat sessions with a full-text index.
+
+    `log` only puts the event on a queue; a background thread writes queued events in
+    batched transactions, so persisting history never blocks the UI.
+    """
+
+    def __init__(self, path: str = HISTORY_FILE):
+        self.path = path
+        self._queue = queue.Queue()
+        self._writer = None
+        self.fts = True
+        with closing(self._connect()) as db:
+            db.executescript(SCHEMA)
+            try:
+                db.executescript(FTS_SCHEMA)
+            except sqlite3.OperationalError:
+                ## sqlite built without FTS5, search falls back to LIKE
+                self.fts = False
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, timeout=10)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    ## writing
+
+    def start_session(self, model: str = None) -> str:
+        session_id = uuid.uuid4().hex[:12]
+        self._queue.put(("session", (session_id, time.time(), model)))
+        self._ensure_writer()
+        return session_id
+
+    def log(self, session_id: str, kind: str, content: str, **meta) -> None:
+        """Queue an event: kind is prompt, response, tool_call or command_output."""
+        self._queue.put(("event", (session_id, time.time(), kind, content, json.dumps(meta) if meta else None)))
+        self._ensure_writer()
+
+    def _ensure_writer(self) -> None:
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+            self._writer.start()
+
+    def _write_loop(self) -> None:
+        db = self._connect()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                batch = [item]
+                deadline = time.monotonic() + FLUSH_INTERVAL
+                stop = False
+                while len(batch) < MAX_BATCH:
+                    try:
+                        item = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stop = True
+                        break
+                    batch.append(item)
+                self._write_batch(db, batch)
+                if stop:
+                    break
+        finally:
+            db.close()
+
+    def _write_batch(self, db, batch: list) -> None:
+        sessions = [values for kind, values in batch if kind == "session"]
+        events = [values for kind, values in batch if kind == "event"]
+        try:
+            with db:
+                db.executemany("INSERT OR IGNORE INTO sessions(id, started_at, model) VALUES (?, ?, ?)", sessions)
+                db.executemany(
+                    "INSERT INTO events(session_id, ts, kind, content, meta) VALUES (?, ?, ?, ?, ?)", events
+                )
+        except sqlite3.Error as error:
+            logging.warning(f"Failed to write {len(batch)} history records: {error}")
+
+    def close(self) -> None:
+        """Flush pending writes and stop the writer thread."""
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join(timeout=5)
+
+    ## reading
+
+    def sessions(self, limit: int = 20) -> list:
+        with closing(self._connect()) as db:
+            return db.execute(
+                """SELECT s.id, s.started_at, s.model, COUNT(e.id),
+                          (SELECT content FROM events WHERE session_id = s.id AND kind = 'prompt' ORDER BY id LIMIT 1)
+                   FROM sessions s LEFT JOIN events e ON e.session_id = s.id
+                   GROUP BY s.id ORDER BY s.started_at DESC LIMIT ?""",
+                (limit,),
+            ).fetchall()
+
+    def search(self, query: str, limit: int = 20) -> list:
+        """Return (session_id, ts, kind, snippet) rows matching `query`, best matches first."""
+        with closing(self._connect()) as db:
+            if self.fts:
+                try:
+                    return db.execute(FTS_SEARCH, (query, limit)).fetchall()
+                except sqlite3.OperationalError:
+                    ## not valid FTS syntax, search for the literal phrase instead
+                    phrase = '"' + query.replace('"', '""') + '"'
+                    return db.execute(FTS_SEARCH, (phrase, limit)).fetchall()
+            return db.execute(
+                """SELECT session_id, ts, kind, substr(content, 1, 120) FROM events
+                   WHERE content LIKE ? ORDER BY id DESC LIMIT ?""",
+                (f"%{query}%", limit),
+            ).fetchall()
+
+    def session_exists(self, session_id: str) -> bool:
+        with closing(self._connect()) as db:
+            return db.execute("SELECT 1 FROM sessions WHERE id = ?", (session_id,)).fetchone() is not None
+
+    def tail(self, session_id: str, limit: int = 30) -> list:
+        """Last `limit` events of a session, oldest first, as (kind, content, meta) tuples."""
+        with closing(self._connect()) as db:
+            rows = db.execute(
+                "SELECT kind, content, meta FROM events WHERE session_id = ? ORDER BY id DESC LIMIT ?",
+                (session_id, limit),
+            ).fetchall()
+        return [(kind, content, json.loads(meta) if meta else {}) for kind, content, meta in reversed(rows)]
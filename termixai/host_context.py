@@ -0,0 +1,158 @@
+import asyncio
+import getpass
+import json
+import logging
+import os
+import platform
+import shutil
+import time
+
+import distro
+
+from termixai.utils.config import CACHE_DIR, get_setting
+
+CACHE_FILE = os.path.join(CACHE_DIR, "host_context.json")
+DEFAULT_TTL = 24 * 60 * 60
+
+## probed with `which`; only the ones installed are listed in the prompt
+PACKAGE_MANAGERS = ["apt", "dnf", "yum", "pacman", "zypper", "apk", "emerge", "nix", "snap", "flatpak",
+                    "brew", "pip3", "pipx", "npm", "cargo", "docker", "podman"]
+
+
+def _cpu_model() -> str:
+    try:
+        with open("/proc/cpuinfo") as cpuinfo:
+            for line in cpuinfo:
+                if line.startswith("model name"):
+                    return " ".join(line.split(":", 1)[1].split())
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def _memory_gib():
+    try:
+        with open("/proc/meminfo") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemTotal:"):
+                    return round(int(line.split()[1]) / 1024 / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def collect() -> dict:
+    """Facts about the machine that stay the same between sessions (blocking, a few ms)."""
+    return {
+        "os": distro.name(pretty=True) or platform.system(),
+        "os_id": distro.id(),
+        "os_version": distro.version(),
+        "os_like": distro.like(),
+        "kernel": f"{platform.system()} {platform.release()}",
+        "arch": platform.machine(),
+        "cpu": _cpu_model(),
+        "cpus": os.cpu_count(),
+        "memory_gib": _memory_gib(),
+        "init": "systemd" if os.path.isdir("/run/systemd/system") else None,
+        "package_managers": [name for name in PACKAGE_MANAGERS if shutil.which(name)],
+    }
+
+
+class HostContext:
+    """Snapshot of the host, kept in the cache directory and added to the system prompt.
+
+    It saves the model a round of discovery commands (`uname -a`, `cat /etc/os-release`,
+    ...) at the start of a conversation. The machine facts are cached on disk with a TTL
+    and refreshed in the background once stale; the stale copy is used meanwhile so the
+    system prompt, and with it the provider's prompt cache, stays the same within a
+    session. Shell, user and working directory are read live on every start.
+    """
+
+    def __init__(self, path: str = CACHE_FILE):
+        self.path = path
+        self._snapshot = None
+        self._collected_at = None
+        self._task = None
+
+    ## read when used, so importing this module does not load the config
+    @property
+    def enabled(self) -> bool:
+        return get_setting("host_context", "enabled", True)
+
+    @property
+    def ttl(self) -> float:
+        return get_setting("host_context", "ttl", DEFAULT_TTL)
+
+    def _load(self) -> None:
+        if self._snapshot is not None:
+            return
+        try:
+            with open(self.path) as f:
+                cached = json.load(f)
+            self._snapshot = cached["snapshot"]
+            self._collected_at = cached["collected_at"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _collect_and_save(self) -> dict:
+        snapshot = collect()
+        collected_at = time.time()
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "w") as f:
+                json.dump({"snapshot": snapshot, "collected_at": collected_at}, f)
+        except OSError as error:
+            logging.warning(f"Could not cache the host context: {error}")
+        self._snapshot = snapshot
+        self._collected_at = collected_at
+        return snapshot
+
+    def snapshot(self):
+        """Cached machine facts, possibly stale, or None if they were never collected."""
+        if not self.enabled:
+            return None
+        self._load()
+        return self._snapshot
+
+    def stale(self) -> bool:
+        self._load()
+        return self._collected_at is None or time.time() - self._collected_at > self.ttl
+
+    async def refresh(self, force: bool = False):
+        """Collect the snapshot in a worker thread if it is missing or older than the TTL."""
+        if not self.enabled or not (force or self.stale()):
+            return self._snapshot
+        loop = asyncio.get_running_loop()
+        ## concurrent callers share one collection
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(asyncio.to_thread(self._collect_and_save))
+        return await asyncio.shield(self._task)
+
+    def prompt(self) -> str:
+        """The snapshot as a system-prompt section, or "" when disabled or not collected yet."""
+        snapshot = self.snapshot()
+        if snapshot is None:
+            return ""
+        shell = os.environ.get("SHELL", "")
+        lines = [
+            f"- OS: {snapshot['os']} (id {snapshot['os_id']}"
+            + (f", like {snapshot['os_like']}" if snapshot["os_like"] else "") + ")",
+            f"- Kernel: {snapshot['kernel']} {snapshot['arch']}",
+            f"- CPU: {snapshot['cpus']} x {snapshot['cpu']}",
+        ]
+        if snapshot["memory_gib"]:
+            lines.append(f"- Memory: {snapshot['memory_gib']} GiB")
+        if snapshot["init"]:
+            lines.append(f"- Init system: {snapshot['init']}")
+        if snapshot["package_managers"]:
+            lines.append(f"- Package managers: {', '.join(snapshot['package_managers'])}")
+        lines += [
+            f"- Shell: {os.path.basename(shell) or 'sh'}" + (f" ({shell})" if shell else ""),
+            f"- User: {getpass.getuser()}",
+            f"- Working directory: {os.getcwd()}",
+        ]
+        return ("Host environment, already known; do not run commands just to discover these:\n"
+                + "\n".join(lines))
+
+
+host_context = HostContext()
@@ -1,20 +1,34 @@
 from textual import on, work
 from textual.app import App, ComposeResult
+from textual.binding import Binding
 from textual.widgets import Header, Input, Footer, Markdown
-from textual.containers import VerticalScroll
 import asyncio
+import itertools
 import logging
+import time
 from textual.logging import TextualHandler
-from textual.widgets import Static, Button, Select
+from textual.widgets import Static, Button, Select, Log, TabbedContent, TabPane
 from textual.containers import Horizontal, Vertical
 from textual.message import Message
-import subprocess
-import json
 import os
 import sys
 # sys.path.append("")  # Adjust path to import termixai modules
-from termixai.utils.config import load_config,get_model_config
+from termixai.utils.config import load_config,get_model_config,get_setting
 from termixai.model_factory import ModelFactory
+from termixai.models.stream import ToolCallAccumulator, open_stream
+from termixai.render import RenderCoalescer
+from termixai.executor import CommandResult, ToolScheduler
+from termixai.host_context import host_context
+from termixai.policy import command_policy
+from termixai.session import Session
+from termixai.tools import ToolArgumentError, tool_registry
+from termixai.history import SessionStore
+from termixai.transcript import Transcript
+from termixai.cache import ResponseCache, replay as replay_cached
+from termixai.utils.compaction import compact_output, estimate_tokens
+from termixai.tracing import tracer
+from termixai.perf_panel import PerfPanel
+from termixai.models.prompt import token_report
 
 logging.basicConfig(
     level="INFO",
@@ -46,6 +60,10 @@ class CommandApprovalRequested(Message):
 class CommandApproval(Static):
     """A little approval form: "Run `…` ?" + [Approve] [Cancel]"""
 
+    def freeze(self):
+        ## still waiting on the user, never evicted from the transcript
+        return None
+
     def __init__(self, command: str,command_description: str, tool_id : str) -> None:
         super().__init__()
         self.command = command
@@ -67,25 +85,506 @@ class CommandApproval(Static):
         # Emit a higher‐level message with the result
         self.post_message(CommandApprovalRequested(self, self.command, approved, tool_id=self.tool_id))
 
+class CommandOutput(Static):
+    """Live output of an approved command, with a Kill button while it runs."""
+
+    def __init__(self, command: str, auto_approved: bool = False) -> None:
+        super().__init__()
+        self.command = command
+        self.auto_approved = auto_approved
+        self.shell = None
+        self.result = None
+        self.started_at = None
+
+    def freeze(self):
+        """Once finished, scrolled-out output is brought back as a one-line summary."""
+        if self.result is None:
+            return None
+        summary = f"[AI]  Used `{self.command}` ({self.result.status()})"
+        return lambda: Static(summary)
+
+    def compose(self):
+        with Vertical():
+            note = " (auto-approved)" if self.auto_approved else ""
+            yield Static(f"[AI]  Using `{self.command}`{note}", id="command_text")
+            yield Log(max_lines=500, auto_scroll=True, id="command_log")
+            with Horizontal(id="command_controls"):
+                yield Button("Kill", id="kill", variant="error")
+                yield Static("queued…", id="command_status")
+
+    def write(self, text: str) -> None:
+        self.query_one("#command_log", Log).write(text)
+
+    def started(self) -> None:
+        self.started_at = time.monotonic()
+        self.query_one("#command_status", Static).update("running…")
+
+    async def finish(self, result) -> None:
+        self.result = result
+        if result.cached:
+            self.add_class("cached")
+        self.query_one("#command_status", Static).update(result.status())
+        await self.query_one("#kill", Button).remove()
+
+    async def cancel(self) -> None:
+        """Settle a command stopped with Esc, queued or running, as killed so it can be frozen."""
+        if self.result is not None:
+            return
+        duration = time.monotonic() - self.started_at if self.started_at is not None else 0.0
+        await self.finish(CommandResult(self.command, None, "", duration, killed=True))
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        if event.button.id == "kill" and self.shell is not None:
+            self.shell.kill()
+            event.button.disabled = True
+
+class SessionView(Vertical):
+    """One chat tab: model picker, transcript and input, driving the turns of its Session."""
+
+    RENDER_FPS = 30
+    TOOL_MEMORY_TOKENS = 200
+    RESUME_TAIL = 30
+    ## seconds the model may take to start answering, and to send the next piece of a stream
+    FIRST_TOKEN_TIMEOUT = 60
+    IDLE_TIMEOUT = 30
+
+    def __init__(self, number: int, resume_session: str = None) -> None:
+        super().__init__()
+        self.number = number
+        self.session = Session(resume_session)
+
+    def compose(self) -> ComposeResult:
+        yield Select(
+            [(model, model) for model in self.app.models],
+            prompt="Choose model",
+            id="model_select"
+        )
+        yield Transcript(id="chat-view")
+        yield Input(placeholder="How can I help you?",id="input_field")
+
+    @property
+    def input_field(self) -> Input:
+        return self.query_one("#input_field", Input)
+
+    @property
+    def title(self) -> str:
+        return f"{self.number}: {self.session.model_name or 'new chat'}"
+
+    def on_mount(self) -> None:
+        if self.session.id:
+            self.load_session_tail(self.session.id)
+
+    @on(Select.Changed, "#model_select")
+    async def model_selected(self, event: Select.Changed) -> None:
+        event.stop()
+        self.session.model_name = event.value
+        ## create model instance 
+        self.session.model = await ModelFactory.create(self.session.model_name)
+        self.app.update_tab(self)
+
+    @work()
+    async def load_session_tail(self, session_id: str) -> None:
+        """Show only the last few events of a resumed session and seed memory with them."""
+        events = await asyncio.to_thread(self.app.history.tail, session_id, self.RESUME_TAIL)
+        chat_view = self.query_one("#chat-view")
+        widgets = [ChatUIMessage(f"Resumed session {session_id}")]
+        for kind, content, meta in events:
+            if kind == "prompt":
+                widgets.append(Prompt(content))
+                self.session.memory.add("user", content)
+            elif kind == "response":
+                widgets.append(Response(content))
+                self.session.memory.add("assistant", content)
+            elif kind == "command_output":
+                widgets.append(Static(f"[AI]  Used `{meta.get('command', '')}` ({meta.get('status', 'done')})"))
+        await chat_view.mount_all(widgets)
+        chat_view.scroll_end(animate=False)
+
+    def record(self, kind: str, content: str, **meta) -> None:
+        """Append an event to the persistent session log (written off the UI thread)."""
+        if self.session.id is None:
+            self.session.id = self.app.history.start_session(self.session.model_name)
+            self.app.update_tab(self)
+        self.app.history.log(self.session.id, kind, content, **meta)
+
+    @on(Input.Submitted)
+    async def on_input(self, event: Input.Submitted) -> None:
+        """Handle user pressing Enter: display prompt, prepare response bubble, and fire off the worker."""
+        event.stop()
+        chat_view = self.query_one("#chat-view")
+        event.input.clear()
+        if self.session.model is None:
+            await chat_view.mount(ChatUIMessage("Please select a model first"))
+            return
+        event.input.disabled = True
+        await chat_view.mount(Prompt(event.value))
+        self.record("prompt", event.value, model=self.session.model_name)
+        ## one trace per turn; every stage below hangs off this span
+        self.session.turn_span = tracer.start(
+            "turn", model=self.session.model_name, session=self.session.id, prompt_tokens=estimate_tokens(event.value)
+        )
+        self.session.turn_usage = []
+        self.session.original_prompt = event.value
+        self.app.update_tab(self)
+        self.send_prompt(event.value)
+
+    async def mount_response(self) -> RenderCoalescer:
+        """Mount an empty Response bubble and return a renderer streaming into it."""
+        resp = Response()
+        await self.query_one("#chat-view").mount(resp)
+        resp.anchor()
+        renderer = RenderCoalescer(resp, max_fps=self.RENDER_FPS)
+        renderer.start()
+        return renderer
+
+    @work(exclusive=True, group="turn")
+    async def send_prompt(self, prompt: str) -> None:
+        await self.run_turn_stage(self.stream_prompt(prompt))
+
+    async def run_turn_stage(self, stage) -> None:
+        """Await a model stage of the turn; a deadline or provider error ends the turn instead of hanging it."""
+        try:
+            await stage
+        except asyncio.TimeoutError:
+            await self.abort_turn("The model stopped responding, the turn was abandoned.")
+        except Exception as error:
+            logging.exception("Turn failed")
+            await self.abort_turn(f"The request failed: {type(error).__name__}: {error}")
+
+    def open_model_stream(self, opening):
+        return open_stream(
+            opening,
+            get_setting("turn", "first_token_timeout", self.FIRST_TOKEN_TIMEOUT),
+            get_setting("turn", "idle_timeout", self.IDLE_TIMEOUT),
+        )
+
+    async def stream_prompt(self, prompt: str) -> None:
+        # 1) stream the model response; text is rendered as it arrives, tool calls are collected
+        started = time.monotonic()
+        first_token = None
+        memory = self.session.memory.context()
+        deployment = getattr(self.session.model, "deployment_name", self.session.model_name)
+        cache_key = self.app.response_cache.key(deployment, prompt, memory)
+        cached = await asyncio.to_thread(self.app.response_cache.get, cache_key)
+        chat_span = self.session.stage_span = tracer.start("chat", parent=self.session.turn_span, cached=cached is not None)
+        if cached is not None:
+            ## same question in the same context: replay the plan or answer without a round trip
+            ## in-memory counters; stats() also counts the entries in SQLite, which would block the loop
+            response_cache = self.app.response_cache
+            self.notify(f"Replayed from cache (hits {response_cache.hits}, misses {response_cache.misses})", timeout=3)
+            deltas = replay_cached(*cached)
+        else:
+            with tracer.activate(chat_span):
+                deltas = await self.open_model_stream(
+                    self.session.model.chat(prompt = prompt, memory = memory, stream = True)
+                )
+
+        renderer = None
+        tool_call_parts = ToolCallAccumulator()
+        try:
+            async for delta in deltas:
+                if delta.usage:
+                    self.session.turn_usage.append(delta.usage)
+                    continue
+                if delta.tool_calls:
+                    tool_call_parts.add(delta.tool_calls)
+                    ## safe commands start as soon as their call is complete, while the rest still streams
+                    for tool_call in tool_call_parts.completed():
+                        await self.auto_approve(tool_call)
+                if first_token is None:
+                    first_token = time.monotonic() - started
+                if delta.content:
+                    if renderer is None:
+                        renderer = await self.mount_response()
+                    renderer.feed(delta.content)  # flushed to the widget by the renderer's timer
+        finally:
+            if renderer is not None:
+                await renderer.close()
+        collected = renderer.text if renderer is not None else ""
+
+        ## check for any tool invokation by AI
+        self.session.tool_calls = tool_call_parts.result() if tool_call_parts else None
+        chat_span.end(
+            first_token_ms=round((first_token or 0) * 1000, 1),
+            prompt_tokens=estimate_tokens(prompt) + sum(estimate_tokens(message["content"]) for message in memory),
+            completion_tokens=estimate_tokens(collected),
+            tool_calls=len(self.session.tool_calls or []),
+        )
+        if cached is None:
+            await asyncio.to_thread(
+                self.app.response_cache.put_turn, cache_key, deployment, prompt, self.session.tool_calls, collected.strip()
+            )
+        logging.info(f"Tool calls: {self.session.tool_calls}")
+        self.session.total_tool_calls = len(self.session.tool_calls) if self.session.tool_calls else 0
+        if self.session.tool_calls:
+            for tool_call in self.session.tool_calls:
+                function_name = tool_call.name
+                tool_id = tool_call.id
+                logging.info(f"Tool call detected: {function_name} (id={tool_id})")
+                started = tool_id in self.session.pending_tool_approvals or tool_id in self.session.tool_call_data
+                if started or await self.auto_approve(tool_call):
+                    continue
+                ## marked pending before the mount yields, so a command finishing meanwhile cannot end the turn
+                self.session.pending_tool_approvals[tool_id] = "This command did not run yet"
+                invocation = self.session.invocations[tool_id]
+                self.record("tool_call", invocation.command, tool_id=tool_id, description=invocation.description)
+                self.session.approval_spans[tool_id] = tracer.start("approval_wait", parent=self.session.turn_span, tool_id=tool_id)
+                await self.query_one("#chat-view").mount(
+                    CommandApproval(invocation.command, invocation.description, tool_id)
+                )
+            self.session.dispatched = True
+            if not self.session.pending_tool_approvals:
+                ## every command was auto-approved and has already finished
+                self.handle_tool_response(self.session.original_prompt, self.session.tool_call_data, self.session.tool_calls)
+            return 
+
+        self.session.memory.add("user", prompt)
+        self.session.memory.add("assistant", collected.strip())
+        self.record("response", collected.strip(), first_token=first_token, duration=time.monotonic() - started)
+        self.finish_turn(tool_calls=0)
+
+        # 2) Reset state
+        self.session.reset_turn()
+        self.turn_finished()
+
+    async def auto_approve(self, tool_call) -> bool:
+        """Start a tool call right away if the approval policy lets it run without asking.
+
+        A call the tool registry rejects is answered with the reason instead of running,
+        so it counts as handled as well.
+        """
+        try:
+            invocation = tool_registry.invocation(tool_call)
+        except ToolArgumentError as error:
+            logging.warning(f"Tool call {tool_call.name} (id={tool_call.id}) rejected: {error}")
+            self.session.tool_call_data[tool_call.id] = f"This call was not run: {error}."
+            self.record("tool_call", tool_call.name, tool_id=tool_call.id, description=str(error), rejected=True)
+            return True
+        self.session.invocations[tool_call.id] = invocation
+        command = invocation.command
+        reason = command_policy.check_tool(command) if invocation.native else command_policy.check(command)
+        if reason is not None:
+            logging.info(f"Approval needed for `{command}`: {reason}")
+            return False
+        self.record("tool_call", command, tool_id=tool_call.id, description=invocation.description, auto_approved=True)
+        self.session.pending_tool_approvals[tool_call.id] = "This command did not run yet"
+        if not invocation.native:
+            command_policy.note_approved(command)
+        output_widget = CommandOutput(command, auto_approved=True)
+        await self.query_one("#chat-view").mount(output_widget)
+        output_widget.anchor()
+        self.run_tool_command(invocation, output_widget)
+        return True
+
+    def finish_turn(self, tool_calls: int, **attributes) -> None:
+        """Close the turn's trace, with its prompt size and provider cache hits when reported."""
+        prefix = getattr(self.session.model, "prefix", None)
+        report = {}
+        if self.session.turn_usage:
+            report = token_report.record(prefix.tokens if prefix else None, self.session.turn_usage)
+        self.session.turn_span.end(tool_calls=tool_calls, **report, **attributes)
+        self.session.turn_span = None
+
+    def turn_finished(self) -> None:
+        """Give the input back and clear the busy mark on the tab."""
+        self.input_field.disabled = False
+        self.app.update_tab(self)
+
+    async def cancel_turn(self) -> None:
+        """Esc: abandon the turn in flight, its model request and any command it is running."""
+        if self.session.turn_span is None:
+            return
+        self.workers.cancel_group(self, "turn")
+        await self.abort_turn("Cancelled.")
+
+    async def abort_turn(self, reason: str) -> None:
+        """End the current turn early and give the input back to the user."""
+        if self.session.turn_span is None:
+            return
+        ## cancelling a command worker SIGKILLs its process group
+        self.workers.cancel_group(self, "commands")
+        ## including commands whose worker was cancelled before it started
+        for output in self.query(CommandOutput):
+            await output.cancel()
+        for approval in self.query(CommandApproval):
+            await approval.remove()
+        for span in self.session.approval_spans.values():
+            span.end(approved=False, cancelled=True)
+        if self.session.stage_span is not None:
+            self.session.stage_span.end(cancelled=True)
+        self.finish_turn(tool_calls=len(self.session.tool_calls or []), cancelled=True, reason=reason)
+        await self.query_one("#chat-view").mount(ChatUIMessage(reason))
+        self.record("cancelled", reason)
+
+        self.session.reset_turn()
+        self.turn_finished()
+
+    @work(exclusive=True, group="turn")
+    async def handle_tool_response(self, original_prompt, tool_call_data, tool_calls):
+        await self.run_turn_stage(self.stream_tool_response(original_prompt, tool_call_data, tool_calls))
+
+    async def stream_tool_response(self, original_prompt, tool_call_data, tool_calls):
+        started = time.monotonic()
+        followup_span = self.session.stage_span = tracer.start(
+            "tool_followup",
+            parent=self.session.turn_span,
+            tool_output_bytes=sum(len(str(output).encode()) for output in tool_call_data.values()),
+        )
+        with tracer.activate(followup_span):
+            toolmsg = await self.session.model.create_tool_msg(tool_call_data)
+            deltas = await self.open_model_stream(self.session.model.send_tool_msg(
+                original_prompt, toolmsg, tool_calls, memory=self.session.memory.context(), stream=True
+            ))
+
+        renderer = None
+        first_token = None
+        try:
+            async for delta in deltas:
+                if delta.usage:
+                    self.session.turn_usage.append(delta.usage)
+                if not delta.content:
+                    continue
+                if first_token is None:
+                    first_token = time.monotonic() - started
+                if renderer is None:
+                    renderer = await self.mount_response()
+                renderer.feed(delta.content)
+        finally:
+            if renderer is not None:
+                await renderer.close()
+        collected = renderer.text if renderer is not None else ""
+
+        followup_span.end(
+            first_token_ms=round((first_token or 0) * 1000, 1),
+            tool_output_tokens=sum(estimate_tokens(str(message.get("content") or "")) for message in toolmsg)
+            if isinstance(toolmsg, list) else None,
+            completion_tokens=estimate_tokens(collected),
+        )
+        self.finish_turn(tool_calls=len(tool_calls))
+
+        ## remember the whole tool turn, with command output cut down to a short excerpt
+        self.session.memory.add("user", original_prompt)
+        for tool_call in tool_calls:
+            command = tool_registry.describe(tool_call)
+            output = compact_output(str(tool_call_data.get(tool_call.id, "")), self.TOOL_MEMORY_TOKENS)
+            self.session.memory.add("assistant", f"[ran `{command}`]\n{output}")
+        self.session.memory.add("assistant", collected.strip())
+        self.record("response", collected.strip(), duration=time.monotonic() - started)
+
+        # Reset state safely and enable the input widget
+        self.session.reset_turn()
+        self.turn_finished()
+
+    @on(CommandApprovalRequested)
+    async def on_command_approval(self, event: CommandApprovalRequested) -> None:
+        chat = self.query_one("#chat-view")
+        await event.sender.remove()
+        if event.tool_id not in self.session.pending_tool_approvals:
+            ## left over from a turn that was cancelled or has already moved on
+            return
+        approval_span = self.session.approval_spans.pop(event.tool_id, None)
+        if approval_span is not None:
+            approval_span.end(approved=event.approved)
+
+        if not event.approved:
+            await chat.mount(Static(f"⚠️ Command `{event.command}` cancelled."))
+            self.session.tool_call_data[event.tool_id]  = "This command did run because it was cancelled by the user"  # Mark as declined
+            self.record("command_output", "", command=event.command, tool_id=event.tool_id, status="cancelled")
+            self.tool_call_finished(event.tool_id)
+        else:
+            invocation = self.session.invocations[event.tool_id]
+            if not invocation.native:
+                command_policy.note_approved(event.command)
+            output_widget = CommandOutput(event.command)
+            await chat.mount(output_widget)
+            output_widget.anchor()
+            self.run_tool_command(invocation, output_widget)
+
+    @work(group="commands")
+    async def run_tool_command(self, invocation, output_widget: CommandOutput) -> None:
+        """Run an approved call off the event handler, streaming output into its widget.
+
+        Native tools are answered in-process; shell commands go through the tool scheduler.
+        """
+        tool_id = invocation.id
+        command = invocation.command
+        command_span = tracer.start(
+            "command", parent=self.session.turn_span, tool_id=tool_id, command=command,
+            auto_approved=output_widget.auto_approved, native=invocation.native,
+        )
+        try:
+            if invocation.native:
+                result = await invocation.run()
+                output_widget.write(result.output)
+            else:
+                shell = self.session.model.create_shell_process(command)
+                output_widget.shell = shell
+                result = await self.session.model.run_shell_process(
+                    shell, self.app.tool_scheduler, on_output=output_widget.write, on_start=output_widget.started
+                )
+        except asyncio.CancelledError:
+            command_span.end(cancelled=True)
+            raise
+        command_span.end(
+            exit_code=result.exit_code,
+            run_ms=round(result.duration * 1000, 1),
+            output_bytes=len(result.output.encode()),
+            truncated=result.truncated,
+            timed_out=result.timed_out,
+            cached=result.cached,
+        )
+        logging.info(f"Command finished: {result.to_dict()}")
+        await output_widget.finish(result)
+        self.record("command_output", result.output, tool_id=tool_id, status=result.status(), **result.to_dict())
+        self.session.tool_call_data[tool_id] = result.to_tool_output()
+        self.tool_call_finished(tool_id)
+
+    def tool_call_finished(self, tool_id: str) -> None:
+        self.session.pending_tool_approvals.pop(tool_id, None)  # Remove from pending approvals
+
+        # ✅ Check if all tools have responded (approved or declined)
+        logging.info(f"Number of pending tool approvals: {len(self.session.pending_tool_approvals)}")
+        logging.info(f"Total tool calls: {self.session.total_tool_calls}")
+        ## commands auto-approved mid-stream can finish before every call is streamed or dispatched
+        if not len(self.session.pending_tool_approvals) and self.session.dispatched:
+            self.handle_tool_response(
+                self.session.original_prompt,
+                self.session.tool_call_data,
+                self.session.tool_calls
+            )
+
+
 class ChatUI(App):
-    """A terminal chat app that role-plays the 'Mother' AI from the Aliens movies."""
+    """A terminal chat app that role-plays the 'Mother' AI from the Aliens movies.
+
+    Each tab is a separate session with its own model, memory and turn in flight, so one
+    can wait on a slow model or command while another is used. Command slots, the history
+    log and the response cache are shared.
+    """
     AUTO_FOCUS = "Input"
     THEME = "nord"
-    _pending_call = None
-    _original_prompt= None
-    _response = None
-    _active_model_name = None
-    _models = list(load_config()["models"].keys())
-    _active_model_instance = None
-    _pending_tool_approvals: dict = {}
-    _total_tool_calls: int = 0
-    _multiple_tool_call_data = {}
-    _tool_calls = None
-    _memory_context : list = []
-    _input_field_widget = None
+    BINDINGS = [
+        ("ctrl+t", "toggle_perf", "Performance"),
+        ("escape", "cancel_turn", "Cancel"),
+        ("ctrl+n", "new_session", "New tab"),
+        ## the chat input binds ctrl+w to delete a word, and it always has focus
+        Binding("ctrl+w", "close_session", "Close tab", priority=True),
+    ]
     TITLE = "TermiXAI Chat UI"
 
     CSS = """
+    TabbedContent {
+        height: 1fr;
+    }
+
+    TabPane {
+        padding: 0;
+    }
+
+    SessionView {
+        height: 1fr;
+    }
+
     Prompt {
         background: $primary 10%;
         color: $text;
@@ -176,153 +675,142 @@ class ChatUI(App):
     CommandApproval Button#cancel:hover {
         background: $error 80%;
     }
-    """
 
-    def compose(self) -> ComposeResult:
-        yield Header()
-        yield Select(
-            [(model, model) for model in self._models],
-            prompt="Choose model",
-            id="model_select"
-        )
+    CommandOutput {
+        border: wide $primary;
+        margin: 1 1 1 3;
+        margin-left: 8;
+        padding: 0 1;
+        height: auto;
+    }
 
-        with VerticalScroll(id="chat-view"):
-            pass
+    CommandOutput Vertical {
+        height: auto;
+    }
 
-        yield Input(placeholder="How can I help you?",id="input_field")
-        yield Footer()
+    CommandOutput Log {
+        height: auto;
+        max-height: 15;
+        background: $surface;
+    }
 
-    @on(Select.Changed, "#model_select")
-    async def model_selected(self, event: Select.Changed) -> None:
-        self._active_model_name = event.value
-        ## create model instance 
-        self._active_model_instance = await ModelFactory.create(self._active_model_name)
+    CommandOutput Horizontal {
+        height: auto;
+        align: left middle;
+    }
 
-    @on(Input.Submitted)
-    async def on_input(self, event: Input.Submitted) -> None:
-        self._input_field_widget = self.query_one("#input_field", Input)
-        self._input_field_widget.disabled = True
+    CommandOutput Button {
+        min-width: 8;
+        margin: 0 1 0 0;
+    }
 
-        """Handle user pressing Enter: display prompt, prepare response bubble, and fire off the worker."""
-        self._memory_context.append({"role": "user", "content": event.value})
-        # Trim memory to last 5
-        self._memory_context = self._memory_context[-5:]
-        chat_view = self.query_one("#chat-view")
-        event.input.clear()
-        if self._active_model_instance is None:
-            await chat_view.mount(ChatUIMessage("Please select a model first"))
-            return
-        await chat_view.mount(Prompt(event.value))
-        self._original_prompt = event.value
-        self.send_prompt(event.value)
+    CommandOutput.cached {
+        border: wide $accent;
+    }
 
-    @work(thread=True)
-    async def send_prompt(self, prompt: str) -> None:
-        # 1) call your Azure model "dry" to get tool_calls
-        self._response = await self._active_model_instance.chat(prompt = prompt, memory = self._memory_context)
-        logging.info(f"Response: {self._response}")
-        if self._active_model_instance.provider == "azure":
-            ## check for any tool invokation by AI
-            self._tool_calls = getattr(self._response.choices[0].message, "tool_calls", None)
-            logging.info(f"Tool calls: {self._tool_calls}")
-            self._total_tool_calls = len(self._tool_calls) if self._tool_calls else 0
-            if self._tool_calls:
-                self._multiple_tool_calls =  True if len(self._tool_calls) > 1 else False
-                for tool_call in self._tool_calls:
-                    function_name = tool_call.function.name
-                    tool_id = tool_call.id
-                    logging.info(f"Tool call detected: {function_name} (id={tool_id})")
-                    arguments = json.loads(tool_call.function.arguments)
-                    if function_name == "run_shell_command":
-                        command = arguments["command"]
-                        command_description = arguments.get("command_description", "No description provided")
-                        self.call_from_thread(
-                            self.query_one("#chat-view").mount,
-                            CommandApproval(command,command_description, tool_id)
-                        )
-                    self._pending_tool_approvals[tool_id] = "This command did not run yet"  # Mark as pending
-                return 
-            
-        stream = self._response.choices[0].message.content.strip()
-
-        self._memory_context.append({"role": "assistant", "content": stream})
-        self._memory_context = self._memory_context[-5:]
-
-        # 2) mount the response like before
-        def create_response_widget():
-            resp = Response()
-            chat_view = self.query_one("#chat-view")
-            chat_view.mount(resp)
-            resp.anchor()
-            return resp
-
-        resp_widget = self.call_from_thread(create_response_widget)
-        collected = ""
-        for part in stream:
-            collected += part
-            self.call_from_thread(resp_widget.update, collected)  # schedule update in main thread
-                # 3) Reset state
-        self._input_field_widget.disabled = False
-        self._original_prompt = None
-        return 
-        
-
-    @work(thread=True)
-    async def handle_tool_response(self, original_prompt, tool_call_data, tool_calls):
-        toolmsg = await self._active_model_instance.create_tool_msg(tool_call_data)
-        ai_response = await self._active_model_instance.send_tool_msg(original_prompt, toolmsg, tool_calls)
-
-        def mount_response():
-            resp = Response()
-            self.query_one("#chat-view").mount(resp)
-            resp.anchor()
-            return resp
-
-        resp_widget = self.call_from_thread(mount_response)
-        collected = ""
-        for part in ai_response:
-            collected += part
-            self.call_from_thread(resp_widget.update, collected)
-
-            ## enable input widget
-        self._input_field_widget.disabled = False
-
-        # Reset state safely
-        self._original_prompt = None
-        self._multiple_tool_call_data = {}
-        self._pending_tool_approvals = {}
-        self._tool_calls = None
-        self._total_tool_calls = 0
+    CommandOutput #command_status {
+        width: 1fr;
+        color: $text-muted;
+    }
+    """
 
-    @on(CommandApprovalRequested)
-    async def on_command_approval(self, event: CommandApprovalRequested) -> None:
-        chat = self.query_one("#chat-view")
-        await event.sender.remove()
+    def __init__(self, resume_session: str = None) -> None:
+        super().__init__()
+        self._resume_session = resume_session
+        self._tab_numbers = itertools.count(1)
+        self.models = list(load_config()["models"].keys())
+        self.tool_scheduler = None
+        self.history = None
+        self.response_cache = None
 
-        if not event.approved:
-            await chat.mount(Static(f"⚠️ Command `{event.command}` cancelled."))
-            self._multiple_tool_call_data[event.tool_id]  = "This command did run because it was cancelled by the user"  # Mark as declined
-            del self._pending_tool_approvals[event.tool_id]
-        else:
-            await chat.mount(Static(f"[AI]  Using `{event.command}`"))
-            proc = await self._active_model_instance.run_shell_process(event.command)
-            output = proc.stdout.read()
-            proc.wait()
-            self._multiple_tool_call_data[event.tool_id] = output
-            del self._pending_tool_approvals[event.tool_id]  # Remove from pending approvals
+    def compose(self) -> ComposeResult:
+        yield Header()
+        yield TabbedContent(id="sessions")
+        perf_panel = PerfPanel(id="perf_panel")
+        perf_panel.display = False
+        yield perf_panel
+        yield Footer()
 
-        # ✅ Check if all tools have responded (approved or declined)
-        logging.info(f"Number of pending tool approvals: {len(self._pending_tool_approvals)}")
-        logging.info(f"Total tool calls: {self._total_tool_calls}")
-        if not len(self._pending_tool_approvals):
-            self.handle_tool_response(
-                self._original_prompt,
-                self._multiple_tool_call_data,
-                self._tool_calls
-            )
-           
+    async def on_mount(self) -> None:
+        ## approved commands start right away and run side by side, up to the configured cap,
+        ## across all tabs
+        self.tool_scheduler = ToolScheduler()
+        self.history = SessionStore()
+        self.response_cache = ResponseCache()
+        self.refresh_host_context()
+        await self.add_session(self._resume_session)
+
+    @property
+    def active_view(self):
+        pane = self.query_one("#sessions", TabbedContent).active_pane
+        return pane.query_one(SessionView) if pane is not None else None
+
+    async def add_session(self, resume_session: str = None) -> SessionView:
+        view = SessionView(next(self._tab_numbers), resume_session)
+        tabs = self.query_one("#sessions", TabbedContent)
+        pane_id = f"session-{view.number}"
+        await tabs.add_pane(TabPane(view.title, view, id=pane_id))
+        tabs.active = pane_id
+        self.update_tab(view)
+        view.input_field.focus()
+        return view
+
+    def update_tab(self, view: SessionView) -> None:
+        """Refresh a tab's label and, for the active tab, the session subtitle.
+
+        Background tabs get a busy mark while their turn runs. The label is only touched
+        when it changes, since relabelling a tab re-lays out the whole tab bar.
+        """
+        pane_id = f"session-{view.number}"
+        tabs = self.query_one("#sessions", TabbedContent)
+        active = tabs.active == pane_id
+        label = f"{view.title} …" if view.session.in_flight and not active else view.title
+        tab = tabs.get_tab(pane_id)
+        if str(tab.label) != label:
+            tab.label = label
+        if active:
+            self.sub_title = f"session {view.session.id}" if view.session.id else ""
+
+    @on(TabbedContent.TabActivated, "#sessions")
+    def session_activated(self, event: TabbedContent.TabActivated) -> None:
+        for view in self.query(SessionView):
+            self.update_tab(view)
+        view = event.pane.query_one(SessionView)
+        if not view.input_field.disabled:
+            view.input_field.focus()
+
+    @work()
+    async def refresh_host_context(self) -> None:
+        ## collected off the UI thread; a stale snapshot is replaced for the next model created
+        await host_context.refresh()
+
+    def action_toggle_perf(self) -> None:
+        self.query_one("#perf_panel", PerfPanel).toggle()
+
+    async def action_cancel_turn(self) -> None:
+        view = self.active_view
+        if view is not None:
+            await view.cancel_turn()
+
+    async def action_new_session(self) -> None:
+        await self.add_session()
+
+    async def action_close_session(self) -> None:
+        """Close the active tab, cancelling its turn; the last tab stays open."""
+        tabs = self.query_one("#sessions", TabbedContent)
+        view = self.active_view
+        if view is None or tabs.tab_count < 2:
+            return
+        await view.cancel_turn()
+        await tabs.remove_pane(f"session-{view.number}")
 
+    async def on_unmount(self) -> None:
+        ## release pooled provider connections
+        await ModelFactory.close_all()
+        if self.history is not None:
+            await asyncio.to_thread(self.history.close)
+        await asyncio.to_thread(tracer.close)
 
 if __name__ == "__main__":
     app = ChatUI()
-    app.run()
\ No newline at end of file
+    app.run()
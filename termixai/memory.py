@@ -0,0 +1,65 @@
+import asyncio
+import logging
+
+from termixai.utils.compaction import estimate_tokens
+from termixai.utils.config import get_setting
+
+DEFAULT_MAX_TOKENS = 3000
+MIN_RECENT_MESSAGES = 2
+
+
+class ConversationMemory:
+    """Short-term memory bounded by an estimated token budget.
+
+    Recent messages are kept verbatim while they fit in `max_tokens`. Older ones are
+    folded into a rolling summary by `summarizer(summary, messages) -> str`, which runs
+    in the background so it never delays the turn that pushed memory over budget.
+    """
+
+    def __init__(self, summarizer=None, max_tokens: int = None):
+        self.summarizer = summarizer
+        self.max_tokens = max_tokens if max_tokens is not None else get_setting("memory", "max_tokens", DEFAULT_MAX_TOKENS)
+        self.summary = ""
+        self._recent = []
+        self._to_fold = []
+        self._summary_task = None
+
+    def add(self, role: str, content: str) -> None:
+        if not content:
+            return
+        self._recent.append({"role": role, "content": content})
+        self._enforce_budget()
+
+    def context(self) -> list:
+        """Messages to send ahead of the new prompt: summary first, then recent turns."""
+        messages = []
+        if self.summary:
+            messages.append({"role": "system", "content": f"Summary of the earlier conversation: {self.summary}"})
+        return messages + list(self._recent)
+
+    def clear(self) -> None:
+        self.summary = ""
+        self._recent.clear()
+        self._to_fold.clear()
+
+    def _tokens(self) -> int:
+        return estimate_tokens(self.summary) + sum(estimate_tokens(message["content"]) for message in self._recent)
+
+    def _enforce_budget(self) -> None:
+        while len(self._recent) > MIN_RECENT_MESSAGES and self._tokens() > self.max_tokens:
+            self._to_fold.append(self._recent.pop(0))
+        if self._to_fold and self.summarizer is not None:
+            if self._summary_task is None or self._summary_task.done():
+                self._summary_task = asyncio.create_task(self._fold())
+        elif self._to_fold:
+            ## nothing to summarize with, so older turns are simply forgotten
+            self._to_fold.clear()
+
+    async def _fold(self) -> None:
+        while self._to_fold:
+            batch = list(self._to_fold)
+            try:
+                self.summary = await self.summarizer(self.summary, batch)
+            except Exception as error:
+                logging.warning(f"Memory summarization failed, dropping {len(batch)} messages: {error}")
+            del self._to_fold[:len(batch)]
@@ -1,22 +1,71 @@
+import sys
+from termixai.host_context import host_context
 from termixai.utils.config import get_model_config
-from termixai.models.openai_model import OpenAIModel
-from termixai.models.azure_model import AzureOpenAIModel
-from termixai.models.gemini_model import GeminiModel
+
+## provider modules pull in their SDKs, so each one is only imported when first used
 class ModelFactory:
+    ## model instances are reused so switching back to a model keeps its client and warm connections
+    _instances = {}
+
     @staticmethod
     async def create(model_name):
+        if model_name in ModelFactory._instances:
+            return ModelFactory._instances[model_name]
+        ## the system prompt includes the host snapshot, so the very first run collects it first
+        if host_context.snapshot() is None:
+            await host_context.refresh()
+        model = await ModelFactory._build(model_name)
+        ModelFactory._instances[model_name] = model
+        return model
+
+    @staticmethod
+    async def _build(model_name):
         model_detials = get_model_config(model_name)
         provider = model_detials["provider"]
         if provider == "openai":
-            return await OpenAIModel(**model_detials)
+            from termixai.models.openai_model import OpenAIModel
+            return OpenAIModel(**model_detials)
 
         elif provider == "azure":
+            from termixai.models.azure_model import AzureOpenAIModel
             return AzureOpenAIModel(
                 **model_detials
             )
 
         elif provider == "gemini":
+            from termixai.models.gemini_model import GeminiModel
             return await GeminiModel(**model_detials)
 
+        elif provider == "router":
+            from termixai.models.router_model import RouterModel
+            deployments = model_detials.get("deployments", [])
+            if not deployments or model_name in deployments:
+                raise ValueError(f"Router '{model_name}' needs a list of other models under 'deployments'")
+            ## backends come from the shared cache so they keep their own clients and connections
+            backends = [await ModelFactory.create(name) for name in deployments]
+            return RouterModel(
+                provider=provider,
+                backends=backends,
+                model_name=model_name,
+                hedge=model_detials.get("hedge", True),
+            )
+
+        elif provider == "replay":
+            from termixai.models.replay_model import ReplayModel
+            details = dict(model_detials)
+            record_from = details.pop("record_from", None)
+            backend = await ModelFactory.create(record_from) if record_from else None
+            return ReplayModel(backend=backend, **details)
+
         else:
             raise ValueError(f"Unknown provider: {provider}")
+
+    @staticmethod
+    async def close_all():
+        for model in ModelFactory._instances.values():
+            close = getattr(model, "close", None)
+            if close is not None:
+                await close()
+        ModelFactory._instances.clear()
+        if "termixai.models.transport" in sys.modules:
+            await sys.modules["termixai.models.transport"].close_all()
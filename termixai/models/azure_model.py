@@ -1,10 +1,14 @@
 
-from azure.ai.inference import ChatCompletionsClient
+from azure.ai.inference.aio import ChatCompletionsClient
 from azure.ai.inference.models import SystemMessage, UserMessage
 from azure.core.credentials import AzureKeyCredential
 from dotenv import load_dotenv
-from azure.ai.inference.models import ToolMessage ,AssistantMessage # Needed to send tool result
 from termixai.models.base_model import BaseModel
+from termixai.models.prompt import PromptPrefix, usage_dict
+from termixai.models.scheduler import estimate_request_tokens, request_scheduler
+from termixai.models.stream import StreamDelta, ToolCallDelta
+from termixai.models.transport import get_azure_transport
+from termixai.tools import tool_registry
 from colorama import Fore
 
 class AzureOpenAIModel(BaseModel):
@@ -14,87 +18,73 @@ class AzureOpenAIModel(BaseModel):
         self.model = ChatCompletionsClient(
             endpoint=endpoint,
             credential=AzureKeyCredential(api_key),
-            
+            transport=get_azure_transport(endpoint),
+            ## retries are left to the shared request scheduler so a 429 slows every request down
+            retry_total=0,
         )
         self.deployment_name = model_name
         self.provider = provider
+        ## everything before the conversation, serialized once for this deployment
+        self.prefix = PromptPrefix(self.system_message, tool_registry.schemas(), model=model_name, temperature=0.7, top_p=1.0)
 
 
+    async def _complete(self, conversation: list, stream: bool, **extra):
+        """Send the precomputed prefix bytes plus `conversation` as the request body."""
+        extra.update(self._extras(stream))
+        body = self.prefix.body(conversation, stream=stream, **extra)
+        headers = {"extra-parameters": "pass-through"} if "stream_options" in extra else None
+        return await request_scheduler.submit(
+            self.deployment_name,
+            lambda: self.model.complete(body=body, stream=stream, headers=headers),
+            tokens=self.prefix.tokens + estimate_request_tokens(conversation),
+        )
 
-    async def chat(self, prompt: str, memory : list) -> str:
+    async def chat(self, prompt: str, memory : list, stream: bool = False):
         # Initial request to model
-   
-        response = self.model.complete(
-            messages = [SystemMessage(content=self.system_message)] + memory + [UserMessage(content=prompt)],
-            model=self.deployment_name,
-            temperature=0.7,
-            top_p=1.0,
-            tools=[
-                {
-                    "id": "terminal_tool",
-                    "type": "function",
-                    "function": {
-                        "name": "run_shell_command",
-                        "description": "A tool to execute terminal commands and return results.",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "command": {
-                                    "type": "string",
-                                    "description": "The terminal command to execute."
-                                },
-                                "command_description": {
-                                    "type": "string",
-                                    "description": "A short description  what the command does."
-                                }
-                            
-                            },
-                            "required": ["command"]
-                        }
-                    }
-                }
-            ] ,
-            
-        )
+        # with stream=True an async iterator of StreamDelta is returned instead of the full response
+        response = await self._complete(memory + [{"role": "user", "content": prompt}], stream)
+        if stream:
+            return self._iter_deltas(response)
 
         return response
-    
 
-    async def create_tool_msg(self, tool_data : dict):
-        tool_messages = []
-        for tool_id, tool_output in tool_data.items():
-            # Create a ToolMessage for each tool call
-            tool_messages.append(
-                ToolMessage(
-                    tool_call_id=tool_id,
-                    content=tool_output
+    async def _iter_deltas(self, response):
+        ## translate SDK streaming updates into provider-neutral deltas
+        try:
+            async for update in response:
+                if update.get("usage"):
+                    yield StreamDelta(usage=usage_dict(update.usage))
+                if not update.choices:
+                    continue
+                choice = update.choices[0]
+                delta = choice.delta
+                tool_calls = []
+                for fragment in (delta.tool_calls or []) if delta else []:
+                    function = fragment.function
+                    tool_calls.append(
+                        ToolCallDelta(
+                            index=fragment.get("index"),
+                            id=fragment.id,
+                            name=function.name if function else None,
+                            arguments=function.arguments if function else None,
+                        )
+                    )
+                yield StreamDelta(
+                    content=delta.content if delta else None,
+                    tool_calls=tool_calls,
+                    finish_reason=choice.finish_reason,
                 )
-            )
-        return tool_messages
-    
-    async def send_tool_msg(self, original_prompt: str, tool_messages : list, tool_calls):
-
-        messages=[
-                    SystemMessage(content=self.system_message), 
-                    UserMessage(content=original_prompt)
-                ]
-          # Append assistant tool call as message
-        messages.append(
-            AssistantMessage(
-                tool_calls=tool_calls,
-                content=None
-            )
-        )
-        messages.extend(tool_messages)
+        finally:
+            ## a cancelled or abandoned stream releases its connection right away
+            await response.aclose()
 
-        # Follow-up ask model to respond with results
-        followup_response = self.model.complete(
-            messages=messages,
+    def _summary_request(self, messages: list):
+        system, user = messages
+        return self.model.complete(
+            messages=[SystemMessage(content=system["content"]), UserMessage(content=user["content"])],
             model=self.deployment_name,
-            temperature=0.7,
-            top_p=1.0,
+            temperature=0.2,
         )
-        final_message = followup_response.choices[0].message.content
 
-        return final_message.strip()
-    
+    async def close(self):
+        await self.model.close()
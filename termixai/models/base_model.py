@@ -1,50 +1,114 @@
-import subprocess
-import json
-import os
-import pkg_resources
-
-class BaseModel:
+from termixai.executor import ShellCommand
+from termixai.command_cache import command_cache
+from termixai.host_context import host_context
+from termixai.models.prompt import normalize_whitespace
+from termixai.models.scheduler import BATCH, estimate_request_tokens, request_scheduler
+from termixai.tools import tool_registry
+from termixai.utils.compaction import compact_tool_outputs
+from termixai.utils.config import get_setting
 
+## commands the model is told never to run; the approval policy never auto-approves them either
+DESTRUCTIVE_COMMANDS = ("rm", "dd", "mkfs", "shutdown")
 
-    def __init__(self):
-        self.system_message = """You are a smart AI assistant embedded in a Linux terminal. You interact with the user in natural language and use shell commands behind the scenes to answer their questions or perform tasks.
+SYSTEM_MESSAGE = normalize_whitespace("""You are a smart AI assistant embedded in a Linux terminal. You interact with the user in natural language and use shell commands behind the scenes to answer their questions or perform tasks.
 
                                 Your behavior:
                                 - Understand the user's intent and determine the safest, most appropriate Linux command(s) to satisfy the request.
                                 - Use the result of the command(s) to provide a clear, human-friendly answer.
-                                - If the request is too vague, unsafe, or would involve destructive actions (like `rm`, `dd`, `mkfs`, `shutdown`, etc), reply politely with an explanation and do not run any command.
+                                - If the request is too vague, unsafe, or would involve destructive actions (like {destructive}, etc), reply politely with an explanation and do not run any command.
                                 - Do not mention you're using shell commands unless the user asks explicitly.
                                 - Do not just paste the raw output. Instead, summarize the key points in plain English and explain what it means.
                                 - Format your answer properly to make it suitable for terminal display.Do not include any markdown or code block tags.
                                 - Interpret User's input and help them with their queries by taking action if needed.
                                 Always prioritize safety and clarity. Speak like a helpful Linux power user — calm, informative, and brief.
                                 
-                          """
+                          """.format(destructive=", ".join(f"`{name}`" for name in DESTRUCTIVE_COMMANDS)))
+
+class BaseModel:
+
+
+    def __init__(self):
+        ## normalized once at import; sent at the start of every request, with the host facts
+        ## appended so the model does not have to run commands to find them out
+        environment = host_context.prompt()
+        self.system_message = f"{SYSTEM_MESSAGE}\n\n{environment}" if environment else SYSTEM_MESSAGE
+        self.summary_instruction = (
+            "You maintain a running summary of a conversation between a user and a Linux terminal assistant. "
+            "Merge the new messages into the current summary. Keep facts about the user's system, commands "
+            "that were run and their key results, and open questions. Reply with the summary only, under 150 words."
+        )
 
 
     async def chat(self, messages):
         pass
 
+    ## providers implement the SDK calls: _complete(conversation, stream, **extra) sends the
+    ## prefix plus `conversation`, _iter_deltas(response) translates stream chunks into
+    ## StreamDeltas and _summary_request(messages) sends a summary prompt
+
+    def _extras(self, stream: bool) -> dict:
+        ## ask for token usage on the last streamed chunk, for the prompt-cache report
+        if stream and get_setting("prompt_cache", "include_usage", True):
+            return {"stream_options": {"include_usage": True}}
+        return {}
 
-    async def load_tools(self, tools_directory=None):
-        if tools_directory is None:
-            # Get the absolute path to the tools directory within the package
-            tools_directory = pkg_resources.resource_filename('termixai', 'models/tools')
-        
-        tools = []
-        for file_name in os.listdir(tools_directory):
-            if file_name.endswith(".json"):
-                with open(os.path.join(tools_directory, file_name), "r") as tool_file:
-                    tools.append(json.load(tool_file))
-        return tools
+    async def create_tool_msg(self, tool_data: dict):
+        ## keep raw command output from blowing the context window
+        tool_data = compact_tool_outputs(tool_data)
+        return [
+            {"role": "tool", "tool_call_id": tool_id, "content": tool_output}
+            for tool_id, tool_output in tool_data.items()
+        ]
+
+    async def send_tool_msg(self, original_prompt: str, tool_messages: list, tool_calls, memory: list = None, stream: bool = False):
+        conversation = (memory or []) + [
+            {"role": "user", "content": original_prompt},
+            {"role": "assistant", "tool_calls": [tool_call.to_dict() for tool_call in tool_calls]},
+        ] + tool_messages
+
+        # Follow-up ask model to respond with results; same prefix (tools included) so it is a cache hit
+        followup_response = await self._complete(conversation, stream, tool_choice="none")
+        if stream:
+            return self._iter_deltas(followup_response)
+        return followup_response.choices[0].message.content.strip()
+
+    async def summarize(self, summary: str, messages: list) -> str:
+        ## fold older turns into the rolling memory summary
+        transcript = "\n".join(f"{message['role']}: {message['content']}" for message in messages)
+        messages = [
+            {"role": "system", "content": self.summary_instruction},
+            {"role": "user", "content": f"Current summary:\n{summary or '(empty)'}\n\nNew messages:\n{transcript}"},
+        ]
+        ## summaries run in the background, so they wait behind interactive turns
+        response = await request_scheduler.submit(
+            self.deployment_name, lambda: self._summary_request(messages),
+            tokens=estimate_request_tokens(messages), priority=BATCH,
+        )
+        return response.choices[0].message.content.strip()
+
+
+    async def load_tools(self):
+        return tool_registry.schemas()
 
     async def load_tool_response(self, response):
         pass
 
     ## tool
-    async def run_shell_process(self, command: str):
-        process = subprocess.Popen(
-            command, shell=True,
-            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
-        )
-        return process
\ No newline at end of file
+    def create_shell_process(self, command: str, cwd: str = None) -> ShellCommand:
+        """Prepare a command for execution; the caller can `run` it and `kill` it."""
+        return ShellCommand(command, cwd=cwd)
+
+    async def run_shell_process(self, shell: ShellCommand, tool_scheduler, on_output=None, on_start=None):
+        """Run an approved command through the tool scheduler, or answer it from the command cache.
+
+        The caller creates `shell` with create_shell_process, so it can kill it while queued.
+        """
+        ## read-only probes are answered from the command cache while fresh
+        cached = command_cache.get(shell.command, shell.cwd)
+        if cached is not None:
+            if on_output is not None:
+                on_output(cached.output)
+            return cached
+        result = await tool_scheduler.run(shell, on_output=on_output, on_start=on_start)
+        command_cache.put(shell.command, result, shell.cwd)
+        return result
@@ -1,4 +1,86 @@
+from openai import AsyncOpenAI
+from termixai.models.base_model import BaseModel
+from termixai.models.prompt import PromptPrefix, usage_dict
+from termixai.models.scheduler import estimate_request_tokens, request_scheduler
+from termixai.models.stream import StreamDelta, ToolCallDelta
+from termixai.models.transport import get_httpx_client
+from termixai.tools import tool_registry
 
-class OpenAIModel():
-    def __init__(self, api_key, model="gpt-4"):
-        pass
\ No newline at end of file
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+
+class OpenAIModel(BaseModel):
+    def __init__(self, provider: str, api_key: str, model_name: str, base_url: str = None):
+        ## Initialize the OpenAI client on the shared keep-alive httpx pool
+        super().__init__()
+        base_url = base_url or DEFAULT_BASE_URL
+        self.model = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=get_httpx_client(base_url),
+            ## retries are left to the shared request scheduler
+            max_retries=0,
+        )
+        self.deployment_name = model_name
+        self.provider = provider
+        ## system message and tools are built once and the same objects are sent every time
+        self.prefix = PromptPrefix(self.system_message, tool_registry.schemas(), temperature=0.7, top_p=1.0)
+
+    async def _complete(self, conversation: list, stream: bool, **extra):
+        messages = self.prefix.messages(conversation)
+        return await request_scheduler.submit(self.deployment_name, lambda: self.model.chat.completions.create(
+            messages=messages,
+            model=self.deployment_name,
+            tools=self.prefix.tools,
+            stream=stream,
+            **self.prefix.params,
+            **self._extras(stream),
+            **extra,
+        ), tokens=self.prefix.tokens + estimate_request_tokens(conversation))
+
+    async def chat(self, prompt: str, memory: list, stream: bool = False):
+        # with stream=True an async iterator of StreamDelta is returned instead of the full response
+        ## several commands can come back in one turn, each gets its own approval
+        response = await self._complete(
+            memory + [{"role": "user", "content": prompt}], stream, parallel_tool_calls=True
+        )
+        if stream:
+            return self._iter_deltas(response)
+
+        return response
+
+    async def _iter_deltas(self, response):
+        ## translate SDK stream chunks into provider-neutral deltas
+        try:
+            async for chunk in response:
+                if chunk.usage:
+                    yield StreamDelta(usage=usage_dict(chunk.usage))
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                delta = choice.delta
+                tool_calls = []
+                for fragment in (delta.tool_calls or []) if delta else []:
+                    function = fragment.function
+                    tool_calls.append(
+                        ToolCallDelta(
+                            index=fragment.index,
+                            id=fragment.id,
+                            name=function.name if function else None,
+                            arguments=function.arguments if function else None,
+                        )
+                    )
+                yield StreamDelta(
+                    content=delta.content if delta else None,
+                    tool_calls=tool_calls,
+                    finish_reason=choice.finish_reason,
+                )
+        finally:
+            ## a cancelled or abandoned stream releases its connection right away
+            await response.close()
+
+    def _summary_request(self, messages: list):
+        return self.model.chat.completions.create(messages=messages, model=self.deployment_name, temperature=0.2)
+
+    async def close(self):
+        ## the httpx pool is shared and closed by transport.close_all(), not by this client
+        pass
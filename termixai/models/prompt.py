@@ -0,0 +1,96 @@
+import hashlib
+import json
+import re
+
+from termixai.utils.compaction import estimate_tokens
+
+## compact and deterministic, so the same prefix always serializes to the same bytes
+_dumps = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+
+def normalize_whitespace(text: str) -> str:
+    """Strip indentation and trailing space, collapse runs of spaces and blank lines."""
+    lines = [re.sub(r"[ \t]+", " ", line).strip() for line in text.strip().splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines))
+
+
+class PromptPrefix:
+    """The part of every chat request that never changes for a model: parameters, tools and
+    the system message.
+
+    It is normalized and serialized once per model instance. Each request then only encodes
+    the conversation that follows, so the prefix is byte-for-byte identical on every call and
+    the provider's prompt cache can reuse it.
+    """
+
+    def __init__(self, system_message: str, tools: list = None, **params):
+        self.system_message = normalize_whitespace(system_message)
+        self.system = {"role": "system", "content": self.system_message}
+        self.tools = tools
+        self.params = params
+        head = dict(params)
+        if tools:
+            head["tools"] = tools
+        ## '{...params,"tools":[...],"messages":[{system}' -- the request continues from here
+        self._head = (_dumps(head)[:-1] + ',"messages":[' + _dumps(self.system)).encode()
+        self.tokens = estimate_tokens(self.system_message) + (estimate_tokens(_dumps(tools)) if tools else 0)
+        self.digest = hashlib.sha256(self._head).hexdigest()[:12]
+
+    def messages(self, conversation: list) -> list:
+        """System message (always the same object) followed by `conversation`."""
+        return [self.system] + conversation
+
+    def body(self, conversation: list, **extra) -> bytes:
+        """Complete JSON request body: the cached prefix bytes plus the encoded conversation."""
+        tail = "".join("," + _dumps(message) for message in conversation) + "]"
+        if extra:
+            tail += "," + _dumps(extra)[1:-1]
+        return self._head + tail.encode() + b"}"
+
+
+def usage_dict(usage) -> dict:
+    """Token usage of a response as {prompt_tokens, completion_tokens, cached_tokens}.
+
+    Works for the OpenAI SDK's pydantic models and the Azure SDK's dict-like models.
+    """
+    if usage is None:
+        return None
+    if hasattr(usage, "model_dump"):
+        usage = usage.model_dump()
+    details = usage.get("prompt_tokens_details") or {}
+    return {
+        "prompt_tokens": usage.get("prompt_tokens") or 0,
+        "completion_tokens": usage.get("completion_tokens") or 0,
+        "cached_tokens": details.get("cached_tokens") or 0,
+    }
+
+
+class TokenReport:
+    """Prompt size and provider prompt-cache hits per turn, and totals for the session."""
+
+    def __init__(self):
+        self.turns = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.last = None
+
+    def record(self, prefix_tokens: int, usages: list) -> dict:
+        """Fold the usage of every request made in a turn into one line of the report."""
+        prompt_tokens = sum(usage["prompt_tokens"] for usage in usages)
+        cached_tokens = sum(usage["cached_tokens"] for usage in usages)
+        self.turns += 1
+        self.prompt_tokens += prompt_tokens
+        self.cached_tokens += cached_tokens
+        self.last = {
+            "prefix_tokens": prefix_tokens,
+            "prompt_tokens": prompt_tokens,
+            "cached_tokens": cached_tokens,
+            "cache_hit_rate": round(cached_tokens / prompt_tokens, 3) if prompt_tokens else None,
+        }
+        return self.last
+
+    def session_hit_rate(self):
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else None
+
+
+token_report = TokenReport()
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+
+from termixai.models.base_model import BaseModel
+from termixai.models.stream import StreamDelta, ToolCallAccumulator, ToolCallDelta
+
+## served when no script is configured: one tool turn, its follow-up, then a plain answer
+DEFAULT_SCRIPT = [
+    {"tool_calls": [{"name": "run_shell_command",
+                     "arguments": json.dumps({"command": "uname -a", "command_description": "Show the kernel"})}]},
+    {"content": "You are running **Linux**. The kernel line above shows the release and architecture.\n\n"
+                "- the hostname is the second field\n- the release follows it\n"},
+    {"content": "Disk usage looks healthy. `/` is **41% full** and `/home` has plenty of room left.\n\n"
+                "- largest directory: `/var/log`\n- no filesystem above 80%\n"},
+]
+
+
+class ReplayModel(BaseModel):
+    """Offline provider that serves scripted or recorded completions.
+
+    Every request (chat or tool follow-up) takes the next entry of the script, cycling
+    when it runs out. An entry has `content` and/or `tool_calls`, and may carry its own
+    `first_token` and `duration` timings; otherwise the configured artificial latency is
+    used. With `record_from`, requests are passed to that model instead and what it
+    streams back is appended to the script file, timings included.
+    """
+
+    def __init__(self, provider: str, model_name: str = "replay", script=None, backend=None,
+                 first_token_latency: float = 0.2, chunk_chars: int = 8, chunk_interval: float = 0.01):
+        super().__init__()
+        self.provider = provider
+        self.deployment_name = model_name
+        self.backend = backend
+        self.first_token_latency = first_token_latency
+        self.chunk_chars = chunk_chars
+        self.chunk_interval = chunk_interval
+        self.script_path = script if isinstance(script, str) else None
+        if isinstance(script, list):
+            self.script = script
+        elif self.script_path and os.path.exists(self.script_path):
+            with open(self.script_path) as f:
+                self.script = json.load(f)
+        else:
+            self.script = [] if backend is not None else DEFAULT_SCRIPT
+        self._position = 0
+
+    def _next_entry(self) -> dict:
+        entry = self.script[self._position % len(self.script)]
+        self._position += 1
+        return entry
+
+    async def _play(self, entry: dict):
+        first_token = entry.get("first_token", self.first_token_latency)
+        content = entry.get("content") or ""
+        chunks = [content[i:i + self.chunk_chars] for i in range(0, len(content), self.chunk_chars)]
+        interval = self.chunk_interval
+        if "duration" in entry and chunks:
+            ## spread the recorded stream time over the chunks
+            interval = max(0.0, entry["duration"] - first_token) / len(chunks)
+        await asyncio.sleep(first_token)
+        for index, call in enumerate(entry.get("tool_calls") or []):
+            ## like a real stream: id and name first, then the arguments in pieces
+            tool_id = call.get("id") or f"call_{uuid.uuid4().hex[:8]}"
+            yield StreamDelta(tool_calls=[ToolCallDelta(index=index, id=tool_id, name=call["name"], arguments="")])
+            arguments = call.get("arguments") or ""
+            for start in range(0, len(arguments), self.chunk_chars):
+                yield StreamDelta(tool_calls=[ToolCallDelta(index=index, arguments=arguments[start:start + self.chunk_chars])])
+        for position, chunk in enumerate(chunks):
+            if position:
+                await asyncio.sleep(interval)
+            yield StreamDelta(content=chunk)
+        yield StreamDelta(finish_reason="tool_calls" if entry.get("tool_calls") else "stop")
+
+    async def _record(self, deltas):
+        """Pass the backend's stream through while capturing it as a script entry."""
+        started = time.monotonic()
+        first_token = None
+        content = []
+        tool_calls = ToolCallAccumulator()
+        async for delta in deltas:
+            if first_token is None:
+                first_token = time.monotonic() - started
+            if delta.tool_calls:
+                tool_calls.add(delta.tool_calls)
+            if delta.content:
+                content.append(delta.content)
+            yield delta
+        entry = {"first_token": round(first_token or 0.0, 3), "duration": round(time.monotonic() - started, 3)}
+        if content:
+            entry["content"] = "".join(content)
+        if tool_calls:
+            entry["tool_calls"] = [{"id": call.id, "name": call.name, "arguments": call.arguments}
+                                   for call in tool_calls.result()]
+        self.script.append(entry)
+        if self.script_path:
+            with open(self.script_path, "w") as f:
+                json.dump(self.script, f, indent=2)
+        logging.info(f"Recorded replay entry {len(self.script)} to {self.script_path}")
+
+    async def _respond(self, stream: bool, request):
+        if self.backend is not None:
+            deltas = self._record(await request(self.backend))
+        else:
+            deltas = self._play(self._next_entry())
+        if stream:
+            return deltas
+        return "".join([delta.content async for delta in deltas if delta.content])
+
+    async def chat(self, prompt: str, memory: list, stream: bool = False):
+        async def request(backend):
+            return await backend.chat(prompt=prompt, memory=memory, stream=True)
+
+        return await self._respond(stream, request)
+
+    async def create_tool_msg(self, tool_data: dict):
+        if self.backend is not None:
+            return await self.backend.create_tool_msg(tool_data)
+        return [{"role": "tool", "tool_call_id": tool_id, "content": output} for tool_id, output in tool_data.items()]
+
+    async def send_tool_msg(self, original_prompt: str, tool_messages, tool_calls, memory: list = None, stream: bool = False):
+        async def request(backend):
+            return await backend.send_tool_msg(original_prompt, tool_messages, tool_calls, memory=memory, stream=True)
+
+        return await self._respond(stream, request)
+
+    async def summarize(self, summary: str, messages: list) -> str:
+        if self.backend is not None:
+            return await self.backend.summarize(summary, messages)
+        await asyncio.sleep(self.first_token_latency)
+        return f"{summary} (+{len(messages)} messages)".strip()
@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import statistics
+import time
+from collections import deque
+
+from termixai.models.base_model import BaseModel
+
+WINDOW = 50
+MIN_SAMPLES = 5
+MAX_ERROR_RATE = 0.5
+COOLDOWN_SECONDS = 30
+
+
+class BackendStats:
+    """Rolling latency and error record of one deployment behind a router."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies = deque(maxlen=WINDOW)
+        self.outcomes = deque(maxlen=WINDOW)
+        self.cooldown_until = 0.0
+
+    def record_success(self, latency: float) -> None:
+        self.latencies.append(latency)
+        self.outcomes.append(True)
+
+    def record_error(self) -> None:
+        self.outcomes.append(False)
+        if self.error_rate() > MAX_ERROR_RATE:
+            self.cooldown_until = time.monotonic() + COOLDOWN_SECONDS
+
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.cooldown_until
+
+    def percentile(self, q: float):
+        if len(self.latencies) < MIN_SAMPLES:
+            return None
+        return statistics.quantiles(self.latencies, n=100)[int(q * 100) - 1]
+
+    def p50(self):
+        return self.percentile(0.50)
+
+    def p95(self):
+        return self.percentile(0.95)
+
+    def snapshot(self) -> dict:
+        return {
+            "p50": self.p50(),
+            "p95": self.p95(),
+            "error_rate": self.error_rate(),
+            "healthy": self.healthy(),
+            "samples": len(self.latencies),
+        }
+
+
+class RouterModel(BaseModel):
+    """A "model" that spreads requests over several configured deployments.
+
+    Each request goes to the healthy backend with the lowest p50 time-to-first-token.
+    With hedging on, a duplicate request is sent to the runner-up once the primary has
+    been silent for longer than its p95; whichever streams first wins and the other is
+    cancelled. Failed backends are skipped over and cooled down when they keep failing.
+    """
+
+    def __init__(self, provider: str, backends: list, model_name: str, hedge: bool = True):
+        super().__init__()
+        self.provider = provider
+        self.deployment_name = model_name
+        self.backends = backends
+        self.hedge = hedge
+        self.stats = {id(backend): BackendStats(backend.deployment_name) for backend in backends}
+
+    def _ranked(self) -> list:
+        def rank(backend):
+            stats = self.stats[id(backend)]
+            p50 = stats.p50()
+            ## backends without enough samples are tried first so every one gets measured
+            return (not stats.healthy(), p50 is not None, p50 or 0.0, stats.error_rate())
+
+        return sorted(self.backends, key=rank)
+
+    def report(self) -> dict:
+        """Rolling stats of every backend, by deployment name, for the perf panel."""
+        return {stats.name: stats.snapshot() for stats in self.stats.values()}
+
+    async def _open(self, backend, request):
+        """Start `request` on `backend` and wait for its first delta."""
+        started = time.monotonic()
+        deltas = await request(backend)
+        try:
+            first = await deltas.__anext__()
+        except StopAsyncIteration:
+            first = None
+        except BaseException:
+            ## lost the race or failed: drop the stream so its connection goes back to the pool
+            await deltas.aclose()
+            raise
+        self.stats[id(backend)].record_success(time.monotonic() - started)
+        return backend, deltas, first
+
+    async def _race(self, request):
+        """Return (backend, deltas, first_delta) from the first backend to start streaming."""
+        candidates = self._ranked()
+        pending = {}
+        errors = []
+        try:
+            while candidates or pending:
+                if not pending:
+                    backend = candidates.pop(0)
+                    pending[asyncio.create_task(self._open(backend, request))] = backend
+                hedge_after = None
+                if self.hedge and candidates and len(pending) == 1:
+                    hedge_after = self.stats[id(next(iter(pending.values())))].p95()
+                done, _ = await asyncio.wait(pending, timeout=hedge_after, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    backend = candidates.pop(0)
+                    logging.info(f"Router {self.deployment_name}: hedging to {backend.deployment_name}")
+                    pending[asyncio.create_task(self._open(backend, request))] = backend
+                    continue
+                for task in done:
+                    backend = pending.pop(task)
+                    if task.exception() is None:
+                        try:
+                            await self._cancel(pending)
+                        except BaseException:
+                            await task.result()[1].aclose()
+                            raise
+                        return task.result()
+                    self.stats[id(backend)].record_error()
+                    errors.append(task.exception())
+                    logging.warning(f"Router {self.deployment_name}: {backend.deployment_name} failed: {task.exception()}")
+            raise errors[-1]
+        except BaseException:
+            ## cancelled (Esc, first-token timeout): hedges still in flight release their streams too
+            await self._cancel(pending)
+            raise
+
+    async def _cancel(self, pending: dict) -> None:
+        """Cancel the losing requests so they release their connections right away."""
+        for task in pending:
+            task.cancel()
+        for task in pending:
+            try:
+                _, deltas, _ = await task
+            except BaseException:
+                continue
+            await deltas.aclose()
+
+    async def _stream(self, request):
+        backend, deltas, first = await self._race(request)
+        ## closed however the reader stops, so the winner's connection goes back to the pool too
+        try:
+            if first is None:
+                return
+            yield first
+            async for delta in deltas:
+                yield delta
+        finally:
+            await deltas.aclose()
+
+    async def _failover(self, request):
+        """Non-streaming requests: try backends in rank order until one succeeds."""
+        error = None
+        for backend in self._ranked():
+            started = time.monotonic()
+            try:
+                result = await request(backend)
+            except Exception as exc:
+                self.stats[id(backend)].record_error()
+                error = exc
+                continue
+            self.stats[id(backend)].record_success(time.monotonic() - started)
+            return result
+        raise error
+
+    async def chat(self, prompt: str, memory: list, stream: bool = False):
+        async def request(backend):
+            return await backend.chat(prompt=prompt, memory=memory, stream=stream)
+
+        if stream:
+            return self._stream(request)
+        return await self._failover(request)
+
+    async def create_tool_msg(self, tool_data: dict):
+        ## messages are built by whichever backend ends up serving the follow-up
+        return tool_data
+
+    async def send_tool_msg(self, original_prompt: str, tool_messages, tool_calls, memory: list = None, stream: bool = False):
+        async def request(backend):
+            backend_messages = await backend.create_tool_msg(tool_messages)
+            return await backend.send_tool_msg(original_prompt, backend_messages, tool_calls, memory=memory, stream=stream)
+
+        if stream:
+            return self._stream(request)
+        return await self._failover(request)
+
+    async def summarize(self, summary: str, messages: list) -> str:
+        async def request(backend):
+            return await backend.summarize(summary, messages)
+
+        return await self._failover(request)
@@ -0,0 +1,258 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import random
+import statistics
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+from termixai.tracing import tracer
+from termixai.utils.compaction import estimate_tokens
+from termixai.utils.config import get_setting
+
+INTERACTIVE = 0
+BATCH = 1
+
+## requests made while this is set to BATCH queue behind interactive ones
+request_priority = contextvars.ContextVar("request_priority", default=INTERACTIVE)
+
+RETRY_STATUS = {408, 429, 500, 502, 503, 504}
+## connection-level failures of the provider SDKs, matched by name so no SDK is imported here
+TRANSIENT_ERRORS = {"ServiceRequestError", "ServiceResponseError", "APIConnectionError", "APITimeoutError"}
+METRICS_WINDOW = 200
+
+
+class SchedulerBusy(Exception):
+    """Raised when a deployment's request queue is full."""
+
+
+def estimate_request_tokens(messages: list) -> int:
+    """Rough token cost of a request: its messages plus an allowance for the completion."""
+    prompt_tokens = sum(estimate_tokens(str(message.get("content") or "")) for message in messages)
+    return prompt_tokens + get_setting("rate_limits", "completion_tokens", 500)
+
+
+def retry_after(exc: Exception):
+    """Seconds the server asked us to wait, from `retry-after-ms` or `Retry-After`."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        if value.strip().isdigit():
+            return float(value)
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(exc: Exception) -> bool:
+    status = getattr(exc, "status_code", None)
+    if status is not None:
+        return status in RETRY_STATUS
+    return type(exc).__name__ in TRANSIENT_ERRORS or isinstance(exc, (ConnectionError, asyncio.TimeoutError))
+
+
+class TokenBucket:
+    """Refills continuously up to `per_minute`; a request may take at most a full bucket."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self.rate = self.capacity / 60
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+
+class Lane:
+    """Admission queue of one deployment, ordered by priority then arrival."""
+
+    def __init__(self, name: str, rpm=None, tpm=None, max_queue: int = 32):
+        self.name = name
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.max_queue = max_queue
+        self.waiting = []
+        self.paused_until = 0.0
+        self._order = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._dispatcher = None
+
+    def pause(self, seconds: float) -> None:
+        """Hold every request to this deployment, e.g. after a 429 with Retry-After."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    async def admit(self, tokens: int, priority: int) -> None:
+        if len(self.waiting) >= self.max_queue:
+            raise SchedulerBusy(f"Request queue for {self.name} is full ({self.max_queue} waiting)")
+        admitted = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiting, (priority, next(self._order), tokens, admitted))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        ## a new arrival may outrank the request the dispatcher is waiting on
+        self._wakeup.set()
+        await admitted
+
+    def _delay(self, tokens: int) -> float:
+        delay = self.paused_until - time.monotonic()
+        if self.requests is not None:
+            delay = max(delay, self.requests.wait_time(1))
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.wait_time(tokens))
+        return delay
+
+    async def _dispatch(self) -> None:
+        while self.waiting:
+            _, _, tokens, admitted = self.waiting[0]
+            if admitted.done():
+                ## the caller was cancelled while queued
+                heapq.heappop(self.waiting)
+                continue
+            delay = self._delay(tokens)
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self.waiting)
+            if self.requests is not None:
+                self.requests.take(1)
+            if self.tokens is not None:
+                self.tokens.take(tokens)
+            admitted.set_result(None)
+
+
+class RequestScheduler:
+    """Shared gate in front of every model API call.
+
+    Each deployment gets a lane with optional requests-per-minute and tokens-per-minute
+    buckets from the `rate_limits` settings, and a bounded queue in which interactive
+    requests go ahead of batch ones. Throttled and transient failures are retried with
+    jittered exponential backoff; a Retry-After from the server pauses the whole lane.
+    """
+
+    def __init__(self):
+        self._lanes = {}
+        self._loop = None
+        self.queue_times = deque(maxlen=METRICS_WINDOW)
+        self.service_times = deque(maxlen=METRICS_WINDOW)
+        self.retries = 0
+        self.rejected = 0
+
+    def _lane(self, deployment: str) -> Lane:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            ## lanes hold futures and events of the loop they were made on
+            self._lanes.clear()
+            self._loop = loop
+        if deployment not in self._lanes:
+            limits = get_setting("rate_limits", "deployments", {}).get(deployment, {})
+            self._lanes[deployment] = Lane(
+                deployment,
+                rpm=limits.get("rpm"),
+                tpm=limits.get("tpm"),
+                max_queue=get_setting("rate_limits", "max_queue", 32),
+            )
+        return self._lanes[deployment]
+
+    def _backoff(self, exc: Exception, attempt: int):
+        """Seconds to wait before retrying, or None if `exc` should be raised."""
+        if attempt >= get_setting("rate_limits", "max_retries", 4) or not is_retryable(exc):
+            return None
+        requested = retry_after(exc)
+        if requested is not None:
+            return requested
+        base = get_setting("rate_limits", "base_delay", 1.0)
+        ceiling = min(get_setting("rate_limits", "max_delay", 30.0), base * 2 ** attempt)
+        return random.uniform(ceiling / 2, ceiling)
+
+    async def submit(self, deployment: str, call, tokens: int = 0, priority: int = None):
+        """Run `call()` (a coroutine factory) once `deployment` has capacity, retrying if needed.
+
+        For streaming calls the service time covers opening the stream, not reading it.
+        """
+        priority = request_priority.get() if priority is None else priority
+        lane = self._lane(deployment)
+        span = tracer.start("model.request", deployment=deployment, estimated_tokens=tokens, priority=priority)
+        attempt = 0
+        try:
+            while True:
+                queued = time.monotonic()
+                try:
+                    await lane.admit(tokens, priority)
+                except SchedulerBusy:
+                    self.rejected += 1
+                    span.end(error="SchedulerBusy", retries=attempt)
+                    raise
+                started = time.monotonic()
+                try:
+                    result = await call()
+                except Exception as exc:
+                    delay = self._backoff(exc, attempt)
+                    if delay is None:
+                        span.end(error=exc.__class__.__name__, status=getattr(exc, "status_code", None), retries=attempt)
+                        raise
+                    attempt += 1
+                    self.retries += 1
+                    logging.warning(f"{deployment}: {exc.__class__.__name__}, retry {attempt} in {delay:.1f}s")
+                    if retry_after(exc) is not None:
+                        lane.pause(delay)
+                    else:
+                        await asyncio.sleep(delay)
+                    continue
+                finished = time.monotonic()
+                self.queue_times.append(started - queued)
+                self.service_times.append(finished - started)
+                logging.info(f"{deployment}: queued {started - queued:.2f}s, service {finished - started:.2f}s")
+                span.end(queue_ms=round((started - queued) * 1000, 1), service_ms=round((finished - started) * 1000, 1),
+                         retries=attempt)
+                return result
+        except asyncio.CancelledError:
+            ## the turn was cancelled or ran past its deadline while queued or connecting
+            span.end(cancelled=True, retries=attempt)
+            raise
+
+    def stats(self) -> dict:
+        def percentiles(samples):
+            if len(samples) < 2:
+                return (samples[0], samples[0]) if samples else (None, None)
+            cuts = statistics.quantiles(samples, n=100)
+            return cuts[49], cuts[94]
+
+        queue_p50, queue_p95 = percentiles(list(self.queue_times))
+        service_p50, service_p95 = percentiles(list(self.service_times))
+        return {
+            "requests": len(self.service_times),
+            "retries": self.retries,
+            "rejected": self.rejected,
+            "queue_p50": queue_p50,
+            "queue_p95": queue_p95,
+            "service_p50": service_p50,
+            "service_p95": service_p95,
+            "waiting": {name: len(lane.waiting) for name, lane in self._lanes.items()},
+        }
+
+
+request_scheduler = RequestScheduler()
@@ -0,0 +1,141 @@
+import asyncio
+import json
+import time
+
+
+class ToolCall:
+    """A fully assembled tool call requested by the model."""
+
+    def __init__(self, id: str, name: str, arguments: str):
+        self.id = id
+        self.name = name
+        self.arguments = arguments
+
+    def parsed_arguments(self) -> dict:
+        return json.loads(self.arguments or "{}")
+
+    def to_dict(self) -> dict:
+        ## wire format accepted by both the Azure inference and OpenAI SDKs
+        return {
+            "id": self.id,
+            "type": "function",
+            "function": {"name": self.name, "arguments": self.arguments},
+        }
+
+    def __repr__(self):
+        return f"ToolCall(id={self.id!r}, name={self.name!r}, arguments={self.arguments!r})"
+
+
+class ToolCallDelta:
+    """A fragment of a tool call as it arrives on the stream.
+
+    The first fragment of a call usually carries the id and function name, the
+    following ones only carry the index and a slice of the JSON arguments.
+    """
+
+    def __init__(self, index=None, id=None, name=None, arguments=None):
+        self.index = index
+        self.id = id
+        self.name = name
+        self.arguments = arguments
+
+
+class StreamDelta:
+    """One streamed update from a provider: a text chunk and/or tool call fragments.
+
+    The last update of a request may instead carry the token `usage` of the request.
+    """
+
+    def __init__(self, content: str = None, tool_calls: list = None, finish_reason: str = None, usage: dict = None):
+        self.content = content
+        self.tool_calls = tool_calls or []
+        self.finish_reason = finish_reason
+        self.usage = usage
+
+
+class ToolCallAccumulator:
+    """Stitches ToolCallDelta fragments back into complete ToolCall objects."""
+
+    def __init__(self):
+        self._calls = {}
+        self._order = []
+        self._last_key = None
+        self._returned = set()
+
+    def add(self, fragments: list) -> None:
+        for fragment in fragments:
+            if fragment.index is not None:
+                key = fragment.index
+            elif fragment.id is not None:
+                key = fragment.id
+            else:
+                ## continuation fragment without index or id belongs to the previous call
+                key = self._last_key
+            if key not in self._calls:
+                self._calls[key] = {"id": None, "name": "", "arguments": ""}
+                self._order.append(key)
+            call = self._calls[key]
+            if fragment.id:
+                call["id"] = fragment.id
+            if fragment.name:
+                call["name"] += fragment.name
+            if fragment.arguments:
+                call["arguments"] += fragment.arguments
+            self._last_key = key
+
+    def __bool__(self):
+        return bool(self._order)
+
+    def completed(self) -> list:
+        """Calls that are fully streamed but not returned by an earlier call to this method.
+
+        A call is complete once its arguments parse as a JSON object: nothing can follow the
+        closing brace, even if fragments of other calls are still arriving.
+        """
+        done = []
+        for key in self._order:
+            call = self._calls[key]
+            if key in self._returned or not call["id"] or not call["arguments"].rstrip().endswith("}"):
+                continue
+            try:
+                json.loads(call["arguments"])
+            except ValueError:
+                continue
+            self._returned.add(key)
+            done.append(ToolCall(call["id"], call["name"], call["arguments"]))
+        return done
+
+    def result(self) -> list:
+        return [
+            ToolCall(self._calls[key]["id"], self._calls[key]["name"], self._calls[key]["arguments"])
+            for key in self._order
+        ]
+
+
+async def open_stream(opening, first_delta: float, idle: float):
+    """Await `opening` (a model call made with stream=True) and put deadlines on its deltas.
+
+    The first delta has to arrive within `first_delta` seconds of the call and every later
+    one within `idle` seconds of the previous, otherwise asyncio.TimeoutError is raised.
+    However the stream ends (finished, timed out or cancelled) it is closed, so the
+    provider connection is released right away.
+    """
+    started = time.monotonic()
+    deltas = await asyncio.wait_for(opening, first_delta)
+    return _with_deadlines(deltas, first_delta - (time.monotonic() - started), idle)
+
+
+async def _with_deadlines(deltas, first_delta: float, idle: float):
+    timeout = first_delta
+    try:
+        while True:
+            try:
+                delta = await asyncio.wait_for(deltas.__anext__(), max(timeout, 0.001))
+            except StopAsyncIteration:
+                return
+            timeout = idle
+            yield delta
+    finally:
+        aclose = getattr(deltas, "aclose", None)
+        if aclose is not None:
+            await aclose()
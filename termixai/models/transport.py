@@ -0,0 +1,60 @@
+from urllib.parse import urlsplit
+
+import aiohttp
+import httpx
+from azure.core.pipeline.transport import AioHttpTransport
+
+## keep-alive connection pools, one per endpoint host, shared by every model instance
+POOL_SIZE = 10
+KEEPALIVE_SECONDS = 120
+
+_aiohttp_sessions = {}
+_httpx_clients = {}
+
+
+def _endpoint_key(endpoint: str) -> str:
+    parts = urlsplit(endpoint)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def get_azure_transport(endpoint: str) -> AioHttpTransport:
+    """Return an azure-core transport backed by the shared aiohttp session for `endpoint`.
+
+    The transport does not own the session, so closing a client does not drop the pool.
+    """
+    key = _endpoint_key(endpoint)
+    session = _aiohttp_sessions.get(key)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit=POOL_SIZE, keepalive_timeout=KEEPALIVE_SECONDS)
+        session = aiohttp.ClientSession(connector=connector)
+        _aiohttp_sessions[key] = session
+    return AioHttpTransport(session=session, session_owner=False)
+
+
+def get_httpx_client(base_url: str) -> httpx.AsyncClient:
+    """Return the shared httpx client for `base_url`'s host."""
+    key = _endpoint_key(base_url)
+    client = _httpx_clients.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=POOL_SIZE,
+                max_keepalive_connections=POOL_SIZE,
+                keepalive_expiry=KEEPALIVE_SECONDS,
+            ),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+        )
+        _httpx_clients[key] = client
+    return client
+
+
+async def close_all() -> None:
+    """Close every pooled connection. Call once when the app shuts down."""
+    for session in _aiohttp_sessions.values():
+        if not session.closed:
+            await session.close()
+    for client in _httpx_clients.values():
+        if not client.is_closed:
+            await client.aclose()
+    _aiohttp_sessions.clear()
+    _httpx_clients.clear()
@@ -0,0 +1,72 @@
+from rich.table import Table
+from textual.widgets import Static
+
+from termixai.models.prompt import token_report
+from termixai.models.router_model import RouterModel
+from termixai.tracing import tracer
+
+## stages in the order a turn goes through them; anything else is listed after
+STAGE_ORDER = ["turn", "chat", "model.request", "approval_wait", "command", "tool_followup"]
+
+
+class PerfPanel(Static):
+    """Live p50/p95 per turn stage for this session, refreshed while the panel is shown."""
+
+    DEFAULT_CSS = """
+    PerfPanel {
+        dock: right;
+        width: 46;
+        height: auto;
+        border: round $accent;
+        background: $surface;
+        padding: 0 1;
+    }
+    """
+
+    REFRESH_SECONDS = 1.0
+
+    def on_mount(self) -> None:
+        self.border_title = "Performance"
+        self._timer = self.set_interval(self.REFRESH_SECONDS, self.refresh_stats, pause=not self.display)
+        self.refresh_stats()
+
+    def toggle(self) -> None:
+        self.display = not self.display
+        if self.display:
+            self.refresh_stats()
+            self._timer.resume()
+        else:
+            self._timer.pause()
+
+    def refresh_stats(self) -> None:
+        stats = tracer.stage_stats()
+        table = Table(box=None, expand=True, padding=(0, 1))
+        table.add_column("stage")
+        table.add_column("n", justify="right")
+        table.add_column("p50", justify="right")
+        table.add_column("p95", justify="right")
+        names = [name for name in STAGE_ORDER if name in stats] + sorted(set(stats) - set(STAGE_ORDER))
+        for name in names:
+            count, p50, p95 = stats[name]
+            table.add_row(name, str(count), f"{p50 * 1000:.0f}ms", f"{p95 * 1000:.0f}ms")
+        if not names:
+            table.add_row("no turns yet", "", "", "")
+        last = token_report.last
+        if last is not None:
+            ## prompt-cache report of the provider, when it returns token usage
+            session_rate = token_report.session_hit_rate() or 0.0
+            table.add_row("", "", "", "")
+            table.add_row("prefix", "", f"{last['prefix_tokens'] or '-'}", "tok")
+            table.add_row("prompt", "", f"{last['prompt_tokens']}", "tok")
+            table.add_row("cache hit", "", f"{(last['cache_hit_rate'] or 0):.0%}", f"{session_rate:.0%} all")
+        view = self.app.active_view
+        model = view.session.model if view is not None else None
+        if isinstance(model, RouterModel):
+            ## time to first token of each deployment behind the router
+            table.add_row("", "", "", "")
+            for name, backend in model.report().items():
+                p50, p95 = backend["p50"], backend["p95"]
+                table.add_row(name if backend["healthy"] else f"{name} (down)", str(backend["samples"]),
+                              f"{p50 * 1000:.0f}ms" if p50 is not None else "-",
+                              f"{p95 * 1000:.0f}ms" if p95 is not None else "-")
+        self.update(table)
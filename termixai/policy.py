@@ -0,0 +1,194 @@
+import os
+import re
+import shlex
+
+from termixai.command_cache import command_cache
+from termixai.models.base_model import DESTRUCTIVE_COMMANDS
+from termixai.utils.config import get_setting
+
+## commands that only read state, matched against each simple command of a pipeline or list
+DEFAULT_ALLOW = [
+    r"(ls|ll|la|stat|file|wc|cat|head|tail|nl|tac|md5sum|sha\d+sum|cksum)( .*)?",
+    r"(grep|egrep|fgrep|rg|zgrep|zcat|cut|tr|column|sort|basename|dirname|realpath|readlink)( .*)?",
+    r"uniq( -[a-zA-Z]+)*( [^-]\S*)?",
+    r"find( .*)?",
+    r"(pwd|whoami|id|groups|nproc|arch|uptime|cal|w|who|last|tty|locale)( -[a-zA-Z-]+)*",
+    r"date( [-+]\S+)*",
+    r"(echo|printf|which|type|command -v|whereis|getent|printenv|env)( .*)?",
+    r"(ps|pgrep|pidof|lsof|ss|netstat|lsblk|lscpu|lsusb|lspci|lsmod|blkid|findmnt|vmstat|iostat)( .*)?",
+    r"(df|du|free|uname|dmesg)( -[a-zA-Z-]+)*( [\w/.~-]+)*",
+    r"hostname( -[sfdAiI]+| --(short|fqdn|long|domain|all-fqdns|ip-address|all-ip-addresses))*",
+    r"(hostnamectl|timedatectl)( status| show)?",
+    r"mount( -l)?( -t \w+)?",
+    r"top -b( -n ?\d+)*",
+    r"systemctl (status|is-active|is-enabled|is-failed|list-units|list-unit-files|list-timers|show|cat)( .*)?",
+    r"journalctl( .*)?",
+    r"(apt list|apt-cache (policy|show|search)|dpkg (-l|-L|-s|--list|--status)|rpm -q[a-z]*|pip3? (list|show|freeze))( .*)?",
+    r"git (status|log|diff|show|config --get)( .*)?",
+    ## branch and remote only in their listing forms; with a name they create, rename or delete
+    r"git branch( -[arv]+| --(all|remotes|verbose|list|show-current))*",
+    r"git remote( -v| --verbose)?",
+]
+
+## never auto-approved, even when an allow rule matches; GNU tools also accept any unambiguous
+## prefix of a long option (`sort --ou=x`), so long options of the tools allowed with any
+## arguments are matched by the shortest prefix that selects them
+DEFAULT_DENY = [
+    r"(sudo|su|doas|pkexec)\b.*",
+    r"(shred|wipefs|fdisk|parted|reboot|poweroff|halt|init|kill|killall|pkill)\b.*",
+    r"find\b.* -(delete|exec|execdir|ok|okdir|fprint|fprint0|fprintf|fls)\b.*",
+    r"sort\b.* (-[a-zA-Z]*o|--o\w*|--co\w*)\b.*",
+    r"date\b.* (-[a-zA-Z]*s|--s\w*)\b.*",
+    r"hostname( [^-].*|\b.* (-[a-zA-Z]*[bF]|--(file|boot))\b.*)",
+    r"git\b.* (--output|--ext-diff)\b.*",
+    r"rg\b.* --pre\b.*",
+    r"file\b.* (-[a-zA-Z]*C|--co\w*)\b.*",
+    r"dmesg\b.* (-[a-zA-Z]*[cCD]|--cl\w*|--con\w*)\b.*",
+    r"journalctl\b.* --(vac\w*|rot\w*|flu\w*|syn\w*|rel\w*|smart-relinquish-var)\b.*",
+    r"tail\b.* (-[a-zA-Z]*[fF]\w*|--f\w*)\b.*",
+    r"journalctl\b.* (-[a-zA-Z]*f\w*|--fol\w*)\b.*",
+    r"env( -[a-zA-Z]+)* +\S+.*",
+]
+
+## list and pipe operators; each side is checked as its own command
+SEPARATORS = {"|", "||", "&&", ";", "|&"}
+REDIRECTS = {">", ">>", ">|", "&>", "&>>", "<", "<<", "<<<", "<&", ">&", "<>"}
+ASSIGNMENT = re.compile(r"[A-Za-z_][A-Za-z0-9_]*=")
+## programs given by path are only trusted from the system directories
+SYSTEM_BIN_DIRS = {"/bin", "/sbin", "/usr/bin", "/usr/sbin", "/usr/local/bin"}
+
+
+def _compile(patterns: list):
+    """One alternation regex for a whole rule list, so each check is a single match."""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+
+
+def split_command(command: str) -> list:
+    """Split a shell command line into simple commands and check its redirections.
+
+    Returns a list of token lists, one per command of the pipeline or list. Raises
+    ValueError with the reason when the line cannot be judged safely: command
+    substitution, subshells, background jobs, heredocs or writes to a file.
+    """
+    if "`" in command or "$(" in command or "\n" in command:
+        raise ValueError("uses command substitution")
+    lexer = shlex.shlex(command, posix=True, punctuation_chars=";&|<>()")
+    lexer.whitespace_split = True
+    tokens = list(lexer)
+
+    commands = [[]]
+    position = 0
+    while position < len(tokens):
+        token = tokens[position]
+        if token in SEPARATORS:
+            commands.append([])
+        elif token in ("&", "(", ")"):
+            raise ValueError("runs a subshell or background job")
+        elif token.strip(";&|<>") == "" and token not in REDIRECTS:
+            raise ValueError(f"uses the {token} operator")
+        elif token in REDIRECTS:
+            target = tokens[position + 1] if position + 1 < len(tokens) else ""
+            ## a numeric token right before the operator is its file descriptor (2>/dev/null)
+            if commands[-1] and commands[-1][-1].isdigit():
+                commands[-1].pop()
+            if token.startswith("<<"):
+                raise ValueError("uses a heredoc")
+            if token == ">&" and target.isdigit():
+                pass
+            elif token != "<" and token != "<&" and target != "/dev/null":
+                raise ValueError(f"writes to {target or 'a file'}")
+            position += 1
+        else:
+            commands[-1].append(token)
+        position += 1
+    if any(not tokens for tokens in commands):
+        raise ValueError("has an empty command")
+    return commands
+
+
+class CommandPolicy:
+    """Decides which proposed commands run without asking.
+
+    A command line is split with shlex into the simple commands of its pipelines and
+    lists. It is auto-approved only when every one of them matches an allow rule (or is
+    a read-only probe known to the command cache) and none matches a deny rule. Anything
+    that redirects into a file, substitutes commands, runs with sudo or starts one of the
+    destructive commands the model is told to avoid always needs approval.
+    """
+
+    def __init__(self):
+        self._loaded = False
+        self.enabled = True
+        self._allow = None
+        self._deny = None
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self.enabled = get_setting("approval_policy", "enabled", True)
+        defaults = get_setting("approval_policy", "use_defaults", True)
+        allow = (DEFAULT_ALLOW if defaults else []) + get_setting("approval_policy", "allow", [])
+        deny = DEFAULT_DENY + get_setting("approval_policy", "deny", [])
+        self._allow = _compile(allow)
+        self._deny = _compile(deny)
+        self._loaded = True
+
+    def check(self, command: str):
+        """None if `command` may run without approval, else the reason it needs one."""
+        self._load()
+        if not self.enabled:
+            return "auto-approval is off"
+        return self._classify(command)
+
+    def _classify(self, command: str):
+        """None if every part of `command` is read-only, else why it is not."""
+        try:
+            commands = split_command(command)
+        except ValueError as error:
+            return str(error)
+        for tokens in commands:
+            if ASSIGNMENT.match(tokens[0]):
+                return "sets environment variables"
+            if "/" in tokens[0] and os.path.dirname(tokens[0]) not in SYSTEM_BIN_DIRS:
+                return f"runs `{tokens[0]}` by path"
+            program = os.path.basename(tokens[0])
+            if program.split(".")[0] in DESTRUCTIVE_COMMANDS:
+                return f"`{program}` is destructive"
+            simple = " ".join([program] + tokens[1:])
+            if self._deny.fullmatch(simple):
+                return f"`{simple}` matches a deny rule"
+            allowed = self._allow is not None and self._allow.fullmatch(simple)
+            if not allowed and not command_cache.is_read_only(simple):
+                return f"`{program}` is not known to be read-only"
+        return None
+
+    def allows(self, command: str) -> bool:
+        return self.check(command) is None
+
+    def note_approved(self, command: str) -> None:
+        """Call when a command is approved to run; one that may change state clears the command cache.
+
+        Uses the same rules as auto-approval, even when that is off, so read-only
+        commands like `ls -la` or `ps aux` keep cached probe results.
+        """
+        self._load()
+        if self._classify(command) is not None:
+            command_cache.clear()
+
+    def check_tool(self, call: str):
+        """Like `check` for a native tool call, written as `list_dir path=/etc`.
+
+        Native tools only read, within fixed bounds, so they run without asking unless
+        auto-approval is off or a deny rule matches the call.
+        """
+        self._load()
+        if not self.enabled:
+            return "auto-approval is off"
+        if self._deny.fullmatch(call):
+            return f"`{call}` matches a deny rule"
+        return None
+
+
+command_policy = CommandPolicy()
@@ -0,0 +1,216 @@
+import os
+import pwd
+import shutil
+import socket
+import stat
+import struct
+
+from termixai.utils.config import get_setting
+
+## every probe returns at most this many entries, and says when it left some out
+DEFAULT_MAX_ENTRIES = 100
+DEFAULT_MAX_READ_BYTES = 32 * 1024
+
+## mounts that are not storage, left out of disk_usage unless a path is asked for
+PSEUDO_FILESYSTEMS = {"proc", "sysfs", "devtmpfs", "devpts", "cgroup", "cgroup2", "securityfs", "pstore",
+                      "debugfs", "tracefs", "configfs", "fusectl", "mqueue", "hugetlbfs", "bpf", "autofs",
+                      "binfmt_misc", "rpc_pipefs", "nsfs", "efivarfs", "ramfs", "squashfs", "overlay"}
+
+TCP_LISTEN = "0A"
+UDP_UNCONNECTED = "07"
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def max_entries() -> int:
+    return get_setting("tools", "max_entries", DEFAULT_MAX_ENTRIES)
+
+
+def _gib(size: int) -> float:
+    return round(size / 1024 ** 3, 2)
+
+
+def _user(uid: int, names: dict) -> str:
+    if uid not in names:
+        try:
+            names[uid] = pwd.getpwuid(uid).pw_name
+        except KeyError:
+            names[uid] = str(uid)
+    return names[uid]
+
+
+def read_file(path: str, start_line: int = 1, max_lines: int = 200) -> dict:
+    """Lines `start_line` onwards of a text file, stopping at max_lines or the byte budget."""
+    budget = get_setting("tools", "max_read_bytes", DEFAULT_MAX_READ_BYTES)
+    lines = []
+    used = 0
+    truncated = False
+    with open(path, "rb") as f:
+        if b"\0" in f.read(1024):
+            raise ValueError(f"{path} is a binary file")
+        f.seek(0)
+        for number, line in enumerate(f, 1):
+            if number < start_line:
+                continue
+            if len(lines) == max_lines or used + len(line) > budget:
+                truncated = True
+                break
+            used += len(line)
+            lines.append(line.decode("utf-8", errors="replace").rstrip("\n"))
+    return {"path": path, "start_line": start_line, "end_line": start_line + len(lines) - 1,
+            "lines": lines, "truncated": truncated}
+
+
+def list_dir(path: str = ".", show_hidden: bool = False) -> dict:
+    """Entries of a directory with their type and size, directories first."""
+    entries = []
+    total = 0
+    with os.scandir(path) as scan:
+        for entry in scan:
+            if entry.name.startswith(".") and not show_hidden:
+                continue
+            total += 1
+            try:
+                info = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if entry.is_symlink():
+                kind = "link"
+            elif stat.S_ISDIR(info.st_mode):
+                kind = "dir"
+            elif stat.S_ISREG(info.st_mode):
+                kind = "file"
+            else:
+                kind = "other"
+            entries.append({"name": entry.name, "type": kind, "size": info.st_size})
+    entries.sort(key=lambda entry: (entry["type"] != "dir", entry["name"]))
+    limit = max_entries()
+    return {"path": path, "entries": entries[:limit], "total": total, "truncated": total > limit}
+
+
+def disk_usage(path: str = None) -> dict:
+    """Size, use and free space of the filesystem holding `path`, or of every mounted one."""
+    if path is not None:
+        usage = shutil.disk_usage(path)
+        return {"path": path, "size_gib": _gib(usage.total), "used_gib": _gib(usage.used),
+                "free_gib": _gib(usage.free), "use_percent": round(usage.used * 100 / usage.total, 1) if usage.total else 0}
+    filesystems = []
+    seen = set()
+    with open("/proc/self/mounts") as mounts:
+        for line in mounts:
+            device, mount_point, fstype = line.split()[:3]
+            mount_point = mount_point.replace("\\040", " ")
+            if fstype in PSEUDO_FILESYSTEMS or device in seen:
+                continue
+            try:
+                info = os.statvfs(mount_point)
+            except OSError:
+                continue
+            if not info.f_blocks:
+                continue
+            seen.add(device)
+            size = info.f_blocks * info.f_frsize
+            free = info.f_bavail * info.f_frsize
+            used = size - info.f_bfree * info.f_frsize
+            filesystems.append({"mount": mount_point, "device": device, "type": fstype, "size_gib": _gib(size),
+                                "used_gib": _gib(used), "free_gib": _gib(free),
+                                "use_percent": round(used * 100 / (used + free), 1) if used + free else 0})
+    filesystems.sort(key=lambda filesystem: -filesystem["use_percent"])
+    limit = max_entries()
+    return {"filesystems": filesystems[:limit], "truncated": len(filesystems) > limit}
+
+
+def process_list(sort: str = "memory", name: str = None, limit: int = 20) -> dict:
+    """Processes from /proc with their memory and CPU time, the top `limit` by `sort`."""
+    processes = []
+    names = {}
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f"/proc/{pid}/stat", "rb") as f:
+                raw = f.read().decode(errors="replace")
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                cmdline = f.read(512).replace(b"\0", b" ").decode(errors="replace").strip()
+            uid = os.stat(f"/proc/{pid}").st_uid
+        except OSError:
+            continue  # exited while we looked
+        ## the command name is in parentheses and may itself contain spaces or parentheses
+        comm = raw[raw.index("(") + 1:raw.rindex(")")]
+        fields = raw[raw.rindex(")") + 2:].split()
+        if name is not None and name not in comm and name not in cmdline:
+            continue
+        processes.append({
+            "pid": int(pid),
+            "ppid": int(fields[1]),
+            "user": _user(uid, names),
+            "state": fields[0],
+            "name": comm,
+            "rss_mib": round(int(fields[21]) * PAGE_SIZE / 1024 ** 2, 1),
+            "cpu_seconds": round((int(fields[11]) + int(fields[12])) / CLOCK_TICKS, 1),
+            "command": cmdline[:200] or f"[{comm}]",
+        })
+    key = {"memory": "rss_mib", "cpu": "cpu_seconds", "pid": "pid"}[sort]
+    processes.sort(key=lambda process: process[key], reverse=sort != "pid")
+    limit = min(limit, max_entries())
+    return {"processes": processes[:limit], "total": len(processes), "truncated": len(processes) > limit}
+
+
+def _address(hex_address: str) -> tuple:
+    host, port = hex_address.split(":")
+    packed = bytes.fromhex(host)
+    if len(packed) == 4:
+        address = socket.inet_ntop(socket.AF_INET, packed[::-1])
+    else:
+        ## /proc stores IPv6 addresses as four host-order 32-bit words
+        address = socket.inet_ntop(socket.AF_INET6, struct.pack("<4I", *struct.unpack(">4I", packed)))
+    return address, int(port, 16)
+
+
+def _socket_owners() -> dict:
+    """Socket inode -> (pid, process name), for the processes we may look into."""
+    owners = {}
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        try:
+            descriptors = os.listdir(f"/proc/{pid}/fd")
+            with open(f"/proc/{pid}/comm") as f:
+                comm = f.read().strip()
+        except OSError:
+            continue
+        for descriptor in descriptors:
+            try:
+                target = os.readlink(f"/proc/{pid}/fd/{descriptor}")
+            except OSError:
+                continue
+            if target.startswith("socket:["):
+                owners[target[8:-1]] = (int(pid), comm)
+    return owners
+
+
+def listening_ports(protocol: str = "all") -> dict:
+    """TCP sockets in LISTEN state and bound UDP sockets, with the process owning each when visible."""
+    tables = {"tcp": ["tcp", "tcp6"], "udp": ["udp", "udp6"], "all": ["tcp", "tcp6", "udp", "udp6"]}[protocol]
+    sockets = []
+    for table in tables:
+        try:
+            with open(f"/proc/net/{table}") as f:
+                rows = f.readlines()[1:]
+        except OSError:
+            continue
+        wanted = TCP_LISTEN if table.startswith("tcp") else UDP_UNCONNECTED
+        for row in rows:
+            fields = row.split()
+            if fields[3] != wanted:
+                continue
+            address, port = _address(fields[1])
+            sockets.append({"protocol": table, "address": address, "port": port, "inode": fields[9]})
+    owners = _socket_owners() if sockets else {}
+    for entry in sockets:
+        pid, process = owners.get(entry.pop("inode"), (None, None))
+        entry["pid"] = pid
+        entry["process"] = process
+    sockets.sort(key=lambda entry: (entry["port"], entry["protocol"]))
+    limit = max_entries()
+    return {"sockets": sockets[:limit], "total": len(sockets), "truncated": len(sockets) > limit}
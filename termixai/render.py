@@ -0,0 +1,51 @@
+import asyncio
+
+
+class RenderCoalescer:
+    """Buffers streamed text and appends it to a Markdown widget at a capped frame rate.
+
+    The turn worker calls `feed` for every delta; the text is only handed to the widget
+    from a timer, at most `max_fps` times per second, using `Markdown.append` so each
+    flush parses just the new tail instead of the whole document.
+    """
+
+    def __init__(self, widget, max_fps: int = 30):
+        self.widget = widget
+        self.interval = 1 / max_fps
+        self.text = ""
+        self._pending = []
+        self._flush_lock = None
+        self._timer = None
+
+    def start(self) -> None:
+        """Start the flush timer."""
+        self._flush_lock = asyncio.Lock()
+        self._timer = self.widget.set_interval(self.interval, self._tick)
+
+    def feed(self, text: str) -> None:
+        """Queue a chunk of text; never waits on the widget."""
+        if not text:
+            return
+        self._pending.append(text)
+        self.text += text
+
+    def _take(self) -> str:
+        chunk = "".join(self._pending)
+        self._pending.clear()
+        return chunk
+
+    async def _tick(self) -> None:
+        async with self._flush_lock:
+            chunk = self._take()
+            if chunk:
+                await self.widget.append(chunk)
+
+    async def close(self) -> None:
+        """Stop the timer and flush whatever is still buffered."""
+        async with self._flush_lock:
+            if self._timer is not None:
+                self._timer.stop()
+                self._timer = None
+            chunk = self._take()
+            if chunk:
+                await self.widget.append(chunk)
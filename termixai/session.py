@@ -0,0 +1,41 @@
+from termixai.memory import ConversationMemory
+
+
+class Session:
+    """State of one conversation: its model, its memory and the turn in flight.
+
+    Every chat tab owns one, so tabs never share approvals, tool results or memory and
+    each can have its own turn running while the others are used. Model instances come
+    from ModelFactory, so sessions on the same model share its client and connections.
+    """
+
+    def __init__(self, session_id: str = None):
+        ## id in the history log; assigned when the first event is recorded
+        self.id = session_id
+        self.model_name = None
+        self.model = None
+        self.memory = ConversationMemory(summarizer=self.summarize)
+        self.turn_span = None
+        self.stage_span = None
+        self.turn_usage = []
+        self.reset_turn()
+
+    def reset_turn(self) -> None:
+        """Forget the tool calls, approvals and results of the last turn."""
+        self.original_prompt = None
+        self.tool_calls = None
+        self.total_tool_calls = 0
+        ## set once every tool call of the turn is running or waiting on the user
+        self.dispatched = False
+        self.pending_tool_approvals = {}
+        ## validated calls by tool id, kept until they are approved and run
+        self.invocations = {}
+        self.tool_call_data = {}
+        self.approval_spans = {}
+
+    @property
+    def in_flight(self) -> bool:
+        return self.turn_span is not None
+
+    async def summarize(self, summary: str, messages: list) -> str:
+        return await self.model.summarize(summary, messages)
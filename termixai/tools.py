@@ -0,0 +1,310 @@
+import asyncio
+import os
+import time
+
+from termixai import probes
+from termixai.executor import CommandResult
+from termixai.utils.config import get_setting
+
+SHELL_TOOL = "run_shell_command"
+
+
+class ToolArgumentError(ValueError):
+    """A tool call names an unknown tool or has arguments its schema does not accept."""
+
+
+## JSON schema types of tool parameters; bool is an int in Python, so it is excluded explicitly
+JSON_TYPES = {"string": str, "integer": int, "number": (int, float), "boolean": bool, "object": dict, "array": list}
+
+
+def _compile_property(name: str, spec: dict):
+    expected = JSON_TYPES[spec["type"]]
+    allowed = set(spec["enum"]) if "enum" in spec else None
+    minimum = spec.get("minimum")
+    maximum = spec.get("maximum")
+
+    def check(value) -> None:
+        if not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool):
+            raise ToolArgumentError(f"`{name}` must be of type {spec['type']}")
+        if allowed is not None and value not in allowed:
+            raise ToolArgumentError(f"`{name}` must be one of {', '.join(map(str, spec['enum']))}")
+        if minimum is not None and value < minimum:
+            raise ToolArgumentError(f"`{name}` must be at least {minimum}")
+        if maximum is not None and value > maximum:
+            raise ToolArgumentError(f"`{name}` must be at most {maximum}")
+
+    return check
+
+
+def compile_schema(schema: dict):
+    """A validator for the parameters schema of a tool, built once when the tool is registered.
+
+    Covers the part of JSON schema that tool parameters use: an object with typed
+    properties, `required`, `enum`, `minimum`/`maximum`, `default` and
+    `additionalProperties`. The validator returns the arguments with defaults filled in.
+    """
+    checks = {name: _compile_property(name, spec) for name, spec in schema.get("properties", {}).items()}
+    defaults = {name: spec["default"] for name, spec in schema.get("properties", {}).items() if "default" in spec}
+    required = tuple(schema.get("required", ()))
+    extra_allowed = schema.get("additionalProperties", True)
+
+    def validate(arguments) -> dict:
+        if not isinstance(arguments, dict):
+            raise ToolArgumentError("arguments must be a JSON object")
+        for name in required:
+            if name not in arguments:
+                raise ToolArgumentError(f"missing required argument `{name}`")
+        for name, value in arguments.items():
+            check = checks.get(name)
+            if check is not None:
+                check(value)
+            elif not extra_allowed:
+                raise ToolArgumentError(f"unexpected argument `{name}`")
+        return {**defaults, **arguments}
+
+    return validate
+
+
+def _cell(value) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def render(data: dict) -> str:
+    """Compact text of a native tool's result, as sent to the model.
+
+    Scalar fields become `key: value` lines, lists of records a header row and one
+    tab-separated line per record, and lists of strings (file lines) are written as is.
+    Next to JSON this drops the quoting and the keys repeated on every record, which
+    are most of the tokens of a listing.
+    """
+    lines = []
+    tables = []
+    for key, value in data.items():
+        if isinstance(value, list):
+            tables.append((key, value))
+        else:
+            lines.append(f"{key}: {_cell(value)}")
+    for key, rows in tables:
+        lines.append(f"{key}:")
+        if rows and isinstance(rows[0], dict):
+            columns = list(rows[0])
+            lines.append("\t".join(columns))
+            lines += ["\t".join(_cell(row[column]) for column in columns) for row in rows]
+        else:
+            lines += [_cell(row) for row in rows]
+    return "\n".join(lines)
+
+
+class Tool:
+    """A function the model can call: its schema, a compiled validator and, for native tools, a handler.
+
+    Native tools are read-only probes answered in this process from `os` and `/proc`,
+    with bounded output, instead of forking a shell. The shell tool has no handler:
+    its command goes through approval and the ToolScheduler.
+    """
+
+    def __init__(self, name: str, description: str, parameters: dict, handler=None):
+        self.name = name
+        self.description = description
+        self.parameters = parameters
+        self.handler = handler
+        self.validate = compile_schema(parameters)
+
+    @property
+    def native(self) -> bool:
+        return self.handler is not None
+
+    def schema(self) -> dict:
+        return {"type": "function", "function": {"name": self.name, "description": self.description,
+                                                 "parameters": self.parameters}}
+
+
+class Invocation:
+    """A validated tool call, ready to be shown to the user and run."""
+
+    def __init__(self, tool: Tool, tool_id: str, arguments: dict):
+        self.tool = tool
+        self.id = tool_id
+        self.arguments = arguments
+
+    @property
+    def native(self) -> bool:
+        return self.tool.native
+
+    @property
+    def command(self) -> str:
+        """The shell command, or for a native tool the call written like one (`list_dir path=/etc`)."""
+        if not self.native:
+            return self.arguments["command"]
+        properties = self.tool.parameters["properties"]
+        given = [f"{name}={value}" for name, value in self.arguments.items()
+                 if "default" not in properties[name] or properties[name]["default"] != value]
+        return " ".join([self.tool.name] + given)
+
+    @property
+    def description(self) -> str:
+        if not self.native:
+            return self.arguments.get("command_description") or "No description provided"
+        return self.tool.description.split(".")[0]
+
+    async def run(self) -> CommandResult:
+        """Answer a native call as a CommandResult whose output is the rendered result."""
+        started = time.monotonic()
+        try:
+            ## /proc scans can take a few ms with many processes, so they stay off the event loop
+            data = await asyncio.to_thread(self.tool.handler, **self.arguments)
+            output, exit_code = render(data), 0
+        except (OSError, ValueError) as error:
+            output, exit_code = f"{type(error).__name__}: {error}", 1
+        return CommandResult(self.command, exit_code, output, time.monotonic() - started)
+
+
+class ToolRegistry:
+    """The tools offered to the model, with their schemas built and compiled once.
+
+    The built-in tools are registered on first use rather than at import, since
+    `tools.native` in the config decides which of them are offered.
+    """
+
+    def __init__(self, builtins=None):
+        self._builtins = builtins
+        self._loaded = builtins is None
+        self._tools = {}
+        self._schemas = []
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        for tool in self._builtins():
+            self.register(tool)
+
+    def register(self, tool: Tool) -> None:
+        self._tools[tool.name] = tool
+        self._schemas.append(tool.schema())
+
+    def get(self, name: str):
+        self._load()
+        return self._tools.get(name)
+
+    def schemas(self) -> list:
+        self._load()
+        return self._schemas
+
+    def invocation(self, tool_call, cwd: str = None) -> Invocation:
+        """Validate a ToolCall from the model; raises ToolArgumentError when it cannot run.
+
+        A native tool's `path` is made absolute against `cwd` (default: the current
+        directory), so it is shown, matched by deny rules and read the same way.
+        """
+        tool = self.get(tool_call.name)
+        if tool is None:
+            raise ToolArgumentError(f"there is no tool named `{tool_call.name}`")
+        try:
+            arguments = tool_call.parsed_arguments()
+        except ValueError:
+            raise ToolArgumentError("arguments are not valid JSON") from None
+        arguments = tool.validate(arguments)
+        if tool.native and "path" in arguments:
+            path = os.path.join(cwd or os.getcwd(), os.path.expanduser(arguments["path"]))
+            arguments["path"] = os.path.normpath(path)
+        return Invocation(tool, tool_call.id, arguments)
+
+    def describe(self, tool_call) -> str:
+        """How a call is shown in memory and results, even when its arguments are invalid."""
+        try:
+            return self.invocation(tool_call).command
+        except ToolArgumentError:
+            return tool_call.name
+
+
+def _path(description: str) -> dict:
+    return {"type": "string", "description": description}
+
+
+def builtin_tools() -> list:
+    """The shell tool, and the native read-only tools unless `tools.native` is off."""
+    tools = [Tool(
+        SHELL_TOOL,
+        "A tool to execute terminal commands and return results.",
+        {
+            "type": "object",
+            "properties": {
+                "command": {"type": "string", "description": "The terminal command to execute."},
+                "command_description": {"type": "string", "description": "A short description of what the command does."},
+            },
+            "required": ["command"],
+        },
+    )]
+    if not get_setting("tools", "native", True):
+        return tools
+    tools.append(Tool(
+        "read_file",
+        "Read lines of a text file. Prefer this over cat, head, tail or sed for looking at files.",
+        {
+            "type": "object",
+            "properties": {
+                "path": _path("File to read, absolute or relative to the working directory."),
+                "start_line": {"type": "integer", "minimum": 1, "default": 1},
+                "max_lines": {"type": "integer", "minimum": 1, "maximum": 1000, "default": 200},
+            },
+            "required": ["path"],
+            "additionalProperties": False,
+        },
+        probes.read_file,
+    ))
+    tools.append(Tool(
+        "list_dir",
+        "List a directory with entry types and sizes. Prefer this over ls.",
+        {
+            "type": "object",
+            "properties": {
+                "path": {**_path("Directory to list; defaults to the working directory."), "default": "."},
+                "show_hidden": {"type": "boolean", "default": False},
+            },
+            "additionalProperties": False,
+        },
+        probes.list_dir,
+    ))
+    tools.append(Tool(
+        "disk_usage",
+        "Size, used and free space of every mounted filesystem, or of the one holding `path`. Prefer this over df.",
+        {
+            "type": "object",
+            "properties": {"path": _path("Any path on the filesystem of interest; omit for all filesystems.")},
+            "additionalProperties": False,
+        },
+        probes.disk_usage,
+    ))
+    tools.append(Tool(
+        "process_list",
+        "Running processes with user, memory (RSS) and CPU time, top ones first. Prefer this over ps or top.",
+        {
+            "type": "object",
+            "properties": {
+                "sort": {"type": "string", "enum": ["memory", "cpu", "pid"], "default": "memory"},
+                "name": {"type": "string", "description": "Only processes whose name or command line contains this."},
+                "limit": {"type": "integer", "minimum": 1, "maximum": 100, "default": 20},
+            },
+            "additionalProperties": False,
+        },
+        probes.process_list,
+    ))
+    tools.append(Tool(
+        "listening_ports",
+        "Listening TCP and bound UDP ports with the owning process. Prefer this over ss, netstat or lsof -i.",
+        {
+            "type": "object",
+            "properties": {"protocol": {"type": "string", "enum": ["tcp", "udp", "all"], "default": "all"}},
+            "additionalProperties": False,
+        },
+        probes.listening_ports,
+    ))
+    return tools
+
+
+tool_registry = ToolRegistry(builtin_tools)
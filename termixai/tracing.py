@@ -0,0 +1,247 @@
+import contextvars
+import json
+import logging
+import os
+import queue
+import secrets
+import statistics
+import threading
+import time
+import urllib.request
+from collections import deque
+from contextlib import contextmanager
+
+from termixai.utils.config import CACHE_DIR, get_setting
+
+TRACE_FILE = os.path.join(CACHE_DIR, "traces.jsonl")
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUPS = 3
+FLUSH_INTERVAL = 1.0
+STAGE_WINDOW = 200
+
+## span that new spans attach to when no parent is given (e.g. model requests inside a turn)
+current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed stage of a turn, with free-form attributes."""
+
+    def __init__(self, tracer, name: str, trace_id: str, parent_id: str = None, **attributes):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_time = time.time()
+        self._started = time.monotonic()
+        self.duration = None
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def end(self, **attributes) -> None:
+        if self.duration is not None:
+            return
+        self.attributes.update(attributes)
+        self.duration = time.monotonic() - self._started
+        self.tracer._finished(self)
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start_time,
+            "duration_ms": round(self.duration * 1000, 3),
+            "attributes": self.attributes,
+        }
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans: list) -> dict:
+    """OTLP/HTTP JSON body for a batch of finished spans."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "termixai"}}]},
+            "scopeSpans": [{
+                "scope": {"name": "termixai"},
+                "spans": [{
+                    "traceId": span["trace_id"],
+                    "spanId": span["span_id"],
+                    "parentSpanId": span["parent_id"] or "",
+                    "name": span["name"],
+                    "kind": 1,
+                    "startTimeUnixNano": str(int(span["start"] * 1e9)),
+                    "endTimeUnixNano": str(int(span["start"] * 1e9 + span["duration_ms"] * 1e6)),
+                    "attributes": [
+                        {"key": key, "value": _otlp_value(value)}
+                        for key, value in span["attributes"].items() if value is not None
+                    ],
+                } for span in spans],
+            }],
+        }]
+    }
+
+
+class SpanExporter:
+    """Writes finished spans to a size-rotated JSONL file and, optionally, an OTLP collector.
+
+    Spans are queued and written in batches by a daemon thread, so tracing never does
+    file or network I/O on the UI loop.
+    """
+
+    def __init__(self, path: str, max_bytes: int, backups: int, otlp_endpoint: str = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.otlp_endpoint = otlp_endpoint.rstrip("/") + "/v1/traces" if otlp_endpoint else None
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._write_loop, name="trace-writer", daemon=True)
+        self._thread.start()
+
+    def export(self, span: dict) -> None:
+        self._queue.put(span)
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            stop = False
+            while True:
+                try:
+                    item = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._write_file(batch)
+            if self.otlp_endpoint:
+                self._post_otlp(batch)
+            if stop:
+                break
+
+    def _rotate(self) -> None:
+        for index in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{index}"):
+                os.replace(f"{self.path}.{index}", f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def _write_file(self, batch: list) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            if os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+                self._rotate()
+            with open(self.path, "a") as f:
+                f.writelines(json.dumps(span, default=str) + "\n" for span in batch)
+        except OSError as error:
+            logging.warning(f"Failed to write {len(batch)} trace spans: {error}")
+
+    def _post_otlp(self, batch: list) -> None:
+        request = urllib.request.Request(
+            self.otlp_endpoint,
+            data=json.dumps(to_otlp(batch), default=str).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            urllib.request.urlopen(request, timeout=5).close()
+        except OSError as error:
+            logging.warning(f"Failed to export {len(batch)} spans to {self.otlp_endpoint}: {error}")
+
+    def close(self) -> None:
+        """Flush queued spans and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+
+
+class Tracer:
+    """Creates spans, exports them when they end, and keeps per-stage timings for the session.
+
+    Settings live under `tracing`: `enabled`, `file`, `max_bytes`, `backups` and an optional
+    `otlp_endpoint` such as http://localhost:4318.
+    """
+
+    def __init__(self):
+        self._exporter = None
+        self._enabled = None
+        self._stages = {}
+
+    @property
+    def enabled(self) -> bool:
+        if self._enabled is None:
+            self._enabled = get_setting("tracing", "enabled", True)
+        return self._enabled
+
+    def start(self, name: str, parent: Span = None, **attributes) -> Span:
+        """Start a span under `parent`, the current span, or as the root of a new trace."""
+        parent = parent or current_span.get()
+        if parent is None:
+            return Span(self, name, secrets.token_hex(16), **attributes)
+        return Span(self, name, parent.trace_id, parent.span_id, **attributes)
+
+    @contextmanager
+    def activate(self, span: Span):
+        """Make `span` the parent of spans started inside this block (e.g. by providers)."""
+        token = current_span.set(span)
+        try:
+            yield span
+        finally:
+            current_span.reset(token)
+
+    @contextmanager
+    def span(self, name: str, parent: Span = None, **attributes):
+        span = self.start(name, parent, **attributes)
+        with self.activate(span):
+            try:
+                yield span
+            except BaseException as error:
+                span.set(error=type(error).__name__)
+                raise
+            finally:
+                span.end()
+
+    def _finished(self, span: Span) -> None:
+        self._stages.setdefault(span.name, deque(maxlen=STAGE_WINDOW)).append(span.duration)
+        if not self.enabled:
+            return
+        if self._exporter is None:
+            self._exporter = SpanExporter(
+                get_setting("tracing", "file", TRACE_FILE),
+                get_setting("tracing", "max_bytes", DEFAULT_MAX_BYTES),
+                get_setting("tracing", "backups", DEFAULT_BACKUPS),
+                get_setting("tracing", "otlp_endpoint"),
+            )
+        self._exporter.export(span.to_dict())
+
+    def stage_stats(self) -> dict:
+        """{stage: (count, p50, p95)} in seconds for the spans finished this session."""
+        stats = {}
+        for name, durations in self._stages.items():
+            samples = sorted(durations)
+            p95 = statistics.quantiles(samples, n=20, method="inclusive")[-1] if len(samples) > 1 else samples[0]
+            stats[name] = (len(samples), statistics.median(samples), p95)
+        return stats
+
+    def close(self) -> None:
+        if self._exporter is not None:
+            self._exporter.close()
+            self._exporter = None
+
+
+tracer = Tracer()
@@ -0,0 +1,110 @@
+from textual.containers import VerticalScroll
+from textual.widgets import Markdown, Static
+
+
+def freeze(widget):
+    """Return a factory that rebuilds `widget` later, or None if it must stay mounted.
+
+    Widgets can take part by defining their own `freeze()`; Markdown bubbles and plain
+    Static lines are rebuilt from their source text.
+    """
+    custom = getattr(widget, "freeze", None)
+    if custom is not None:
+        return custom()
+    if isinstance(widget, Markdown):
+        widget_type, source = type(widget), widget.source
+        return lambda: widget_type(source)
+    if type(widget) is Static:
+        content = widget.content
+        return lambda: Static(content)
+    return None
+
+
+class Transcript(VerticalScroll):
+    """Chat view that keeps only the newest messages mounted.
+
+    Once more than MAX_MOUNTED messages are mounted and the view is following the bottom,
+    the oldest ones are removed and kept as lightweight factories (their Markdown render
+    caches go with them). Scrolling to the top re-mounts them a page at a time, so layout
+    and repaint cost stay flat however long the session runs.
+    """
+
+    MAX_MOUNTED = 80
+    PAGE = 20
+
+    DEFAULT_CSS = """
+    Transcript #transcript-more {
+        color: $text-muted;
+        text-align: center;
+        width: 1fr;
+        margin: 1 0 0 0;
+    }
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._frozen = []
+        self._placeholder = Static("", id="transcript-more")
+        self._placeholder.display = False
+        self._thawing = False
+
+    def compose(self):
+        yield self._placeholder
+
+    def on_mount(self) -> None:
+        self.anchor()
+
+    @property
+    def message_count(self) -> int:
+        return len(self._frozen) + len(self._live())
+
+    def _live(self) -> list:
+        return [child for child in self.children if child is not self._placeholder]
+
+    def mount(self, *widgets, **kwargs):
+        result = super().mount(*widgets, **kwargs)
+        self.call_after_refresh(self._trim)
+        return result
+
+    def _update_placeholder(self) -> None:
+        self._placeholder.display = bool(self._frozen)
+        self._placeholder.update(f"↑ {len(self._frozen)} earlier messages, scroll up to load")
+
+    async def _trim(self) -> None:
+        ## only evict while following the conversation, never under the reader's eyes
+        if self._thawing or self.scroll_y < self.max_scroll_y - 1:
+            return
+        live = self._live()
+        excess = len(live) - self.MAX_MOUNTED
+        if excess <= 0:
+            return
+        evicted = []
+        for widget in live[:excess]:
+            factory = freeze(widget)
+            if factory is None:
+                break
+            self._frozen.append(factory)
+            evicted.append(widget)
+        if evicted:
+            await self.remove_children(evicted)
+            self._update_placeholder()
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        super().watch_scroll_y(old_value, new_value)
+        if new_value <= 0 and self._frozen and not self._thawing:
+            self._thawing = True
+            self.call_later(self._thaw)
+
+    async def _thaw(self) -> None:
+        """Re-mount the previous page of evicted messages above the current view."""
+        page = self._frozen[-self.PAGE:]
+        del self._frozen[-self.PAGE:]
+        height_before = self.virtual_size.height
+        await super().mount(*[factory() for factory in page], after=self._placeholder)
+        self._update_placeholder()
+        self.call_after_refresh(self._keep_position, height_before)
+
+    def _keep_position(self, height_before: int) -> None:
+        ## the new messages pushed the content down; keep the reader where they were
+        self.scroll_to(y=self.scroll_y + self.virtual_size.height - height_before, animate=False, immediate=True)
+        self._thawing = False
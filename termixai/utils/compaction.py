@@ -0,0 +1,169 @@
+import math
+import re
+
+from termixai.utils.config import get_setting
+
+DEFAULT_MAX_TOKENS_PER_TOOL = 2000
+DEFAULT_MAX_TOKENS_PER_TURN = 6000
+MAX_CELL_CHARS = 60
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_VOLATILE_PATTERN = re.compile(r"0x[0-9a-fA-F]+|\d+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate: punctuation counts as one token, words as one per ~4 chars."""
+    if not text:
+        return 0
+    return sum(math.ceil(len(piece) / 4) for piece in _TOKEN_PATTERN.findall(text))
+
+
+def dedupe_lines(lines: list) -> list:
+    """Collapse runs of lines that only differ in numbers (timestamps, pids, counters)."""
+    result = []
+    run_key = None
+    run_length = 0
+    for line in lines:
+        key = _VOLATILE_PATTERN.sub("#", line).strip()
+        if key == run_key:
+            run_length += 1
+            continue
+        if run_length:
+            result.append(f"… (similar line repeated {run_length} more times)")
+        result.append(line)
+        run_key = key
+        run_length = 0
+    if run_length:
+        result.append(f"… (similar line repeated {run_length} more times)")
+    return result
+
+
+def prune_columns(lines: list) -> list:
+    """Shrink whitespace-aligned tables such as `ps aux` or `df -h`.
+
+    The first line is taken as the header. Columns holding the same value on every row
+    are dropped and long cells in the last column are cut. Anything that does not look
+    like a table is returned unchanged.
+    """
+    if len(lines) < 3:
+        return lines
+    header = lines[0].split()
+    width = len(header)
+    if width < 3:
+        return lines
+    rows = [line.split(None, width - 1) for line in lines[1:] if line.strip()]
+    if sum(1 for row in rows if len(row) == width) < 0.8 * len(rows):
+        return lines
+    rows = [row for row in rows if len(row) == width]
+
+    keep = [
+        index for index in range(width)
+        if index == width - 1 or len({row[index] for row in rows}) > 1
+    ]
+    if len(rows) < 2:
+        keep = list(range(width))
+
+    def shorten(cell):
+        return cell if len(cell) <= MAX_CELL_CHARS else cell[:MAX_CELL_CHARS - 1] + "…"
+
+    pruned = [" ".join(header[index] for index in keep)]
+    for row in rows:
+        pruned.append(" ".join(shorten(row[index]) for index in keep))
+    dropped = [header[index] for index in range(width) if index not in keep]
+    if dropped:
+        pruned.append(f"… (constant columns dropped: {', '.join(dropped)})")
+    return pruned
+
+
+def _fit_chars(line: str, budget: int, from_end: bool = False) -> str:
+    """The longest start (or end) of `line` that fits in `budget` tokens."""
+    low, high = 0, len(line)
+    while low < high:
+        size = (low + high + 1) // 2
+        piece = line[-size:] if from_end else line[:size]
+        if estimate_tokens(piece) <= budget:
+            low = size
+        else:
+            high = size - 1
+    if not low:
+        return ""
+    return line[-low:] if from_end else line[:low]
+
+
+def keep_head_tail(lines: list, budget: int) -> list:
+    """Keep as many lines from the start and (preferably) the end as fit in `budget` tokens.
+
+    When the next line does not fit whole, as much of it as fits is kept instead, so a
+    single huge line (minified JSON, `kubectl -o json`) still shows its start and end.
+    """
+    head_budget = budget // 3
+    tail_budget = budget - head_budget
+    head, tail = [], []
+    used = 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > head_budget:
+            break
+        head.append(line)
+        used += cost
+    head_left = head_budget - used
+    used = 0
+    for line in reversed(lines[len(head):]):
+        cost = estimate_tokens(line) + 1
+        if used + cost > tail_budget:
+            break
+        tail.append(line)
+        used += cost
+    tail.reverse()
+    tail_left = tail_budget - used
+    middle = lines[len(head):len(lines) - len(tail)]
+    if not middle:
+        return lines
+
+    ## a few tokens are left for the ellipses and the elision marker
+    first = _fit_chars(middle[0], head_left - 3) if head_left > 8 else ""
+    last = _fit_chars(middle[-1], tail_left - 3, from_end=True) if tail_left > 8 else ""
+    if len(middle) == 1:
+        last = last[len(first) + len(last) - len(middle[0]):] if len(first) + len(last) > len(middle[0]) else last
+        marker = f"… [{len(middle[0]) - len(first) - len(last)} characters elided to fit the token budget] …"
+    else:
+        elided = len(middle) - bool(first) - bool(last)
+        marker = f"… [{elided} lines elided to fit the token budget] …"
+    return head + ([first + " …"] if first else []) + [marker] + (["… " + last] if last else []) + tail
+
+
+def compact_output(text: str, budget: int, prune_tables: bool = True) -> str:
+    """Fit one tool output under `budget` tokens, trying the lossless-ish steps first."""
+    if estimate_tokens(text) <= budget:
+        return text
+    lines = dedupe_lines(text.splitlines())
+    if prune_tables:
+        lines = prune_columns(lines)
+    if estimate_tokens("\n".join(lines)) <= budget:
+        return "\n".join(lines)
+    return "\n".join(keep_head_tail(lines, budget))
+
+
+def compact_tool_outputs(tool_data: dict) -> dict:
+    """Compact every tool output of a turn to the per-tool and per-turn budgets from config.
+
+    Small outputs keep what they need and the rest of the turn budget is shared between
+    the larger ones.
+    """
+    per_tool = get_setting("tool_output", "max_tokens_per_tool", DEFAULT_MAX_TOKENS_PER_TOOL)
+    per_turn = get_setting("tool_output", "max_tokens_per_turn", DEFAULT_MAX_TOKENS_PER_TURN)
+    prune_tables = get_setting("tool_output", "prune_columns", True)
+
+    sizes = {tool_id: estimate_tokens(output) for tool_id, output in tool_data.items()}
+    remaining = per_turn
+    budgets = {}
+    pending = sorted(tool_data, key=lambda tool_id: sizes[tool_id])
+    for position, tool_id in enumerate(pending):
+        share = remaining // (len(pending) - position)
+        budgets[tool_id] = min(per_tool, share, sizes[tool_id])
+        remaining -= budgets[tool_id]
+
+    return {
+        tool_id: compact_output(output, max(budgets[tool_id], 1), prune_tables=prune_tables)
+        for tool_id, output in tool_data.items()
+    }
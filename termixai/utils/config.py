@@ -1,21 +1,28 @@
 import os
 import json
-from platformdirs import user_config_dir
+from platformdirs import user_config_dir, user_cache_dir
 
-CONFIG_DIR = user_config_dir("ai_assist")
-APP_NAME = "ai_assist"
+APP_NAME = "termixai"
 CONFIG_DIR = user_config_dir(APP_NAME)
 CONFIG_FILE = os.path.join(CONFIG_DIR, "config.json")
+CACHE_DIR = user_cache_dir(APP_NAME)
 
 
 
 # 👇 Add this before writing the file
 os.makedirs(CONFIG_DIR, exist_ok=True)
+## parsed config, reused until the file changes on disk
+_cached_config = {"mtime": None, "config": None}
+
 def load_config():
     if not os.path.exists(CONFIG_FILE):
         return {"models": {}}  # Return an empty config if file doesn't exist
-    with open(CONFIG_FILE, "r") as f:
-        return json.load(f)
+    mtime = os.path.getmtime(CONFIG_FILE)
+    if _cached_config["mtime"] != mtime:
+        with open(CONFIG_FILE, "r") as f:
+            _cached_config["config"] = json.load(f)
+        _cached_config["mtime"] = mtime
+    return _cached_config["config"]
 
 def get_model_config(model_name):
     config = load_config()
@@ -23,3 +30,8 @@ def get_model_config(model_name):
     if model_name not in profiles:
         raise ValueError(f"Model '{model_name}' not found.")
     return profiles[model_name]
+
+def get_setting(section, key, default=None):
+    """Read an optional tuning value from a top-level section of config.json."""
+    config = load_config()
+    return config.get(section, {}).get(key, default)
@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+## keep the tests away from the user's config, history and caches; set before termixai is imported
+_home = tempfile.mkdtemp(prefix="termixai-tests-")
+os.environ["XDG_CONFIG_HOME"] = os.path.join(_home, "config")
+os.environ["XDG_CACHE_HOME"] = os.path.join(_home, "cache")
@@ -0,0 +1,23 @@
+import pytest
+
+from termixai.batch import read_prompts
+
+
+def test_lines_that_are_not_objects_are_prompts(tmp_path):
+    path = tmp_path / "prompts.jsonl"
+    path.write_text('42\nnull\n[1]\n"quoted"\nplain text\n\n{"prompt": "from object", "id": "a"}\n')
+    assert read_prompts(str(path)) == [
+        {"prompt": "42", "id": 1},
+        {"prompt": "null", "id": 2},
+        {"prompt": "[1]", "id": 3},
+        {"prompt": "quoted", "id": 4},
+        {"prompt": "plain text", "id": 5},
+        {"prompt": "from object", "id": "a"},
+    ]
+
+
+def test_object_without_prompt_is_rejected_with_its_line(tmp_path):
+    path = tmp_path / "prompts.jsonl"
+    path.write_text('"first"\n{"id": 3}\n')
+    with pytest.raises(SystemExit, match="line 2"):
+        read_prompts(str(path))
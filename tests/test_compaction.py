@@ -0,0 +1,18 @@
+import json
+
+from termixai.utils.compaction import compact_output
+
+
+def test_single_long_line_keeps_its_start_and_end():
+    text = json.dumps([{"id": number, "name": f"item{number}"} for number in range(3000)])
+    compacted = compact_output(text, 2000)
+    assert compacted.startswith('[{"id": 0, "name": "item0"}')
+    assert compacted.endswith('{"id": 2999, "name": "item2999"}]')
+    assert "characters elided" in compacted
+
+
+def test_long_middle_line_is_cut_not_dropped():
+    compacted = compact_output("header\n" + "x y " * 10000 + "\nfooter", 300).splitlines()
+    assert compacted[0] == "header" and compacted[-1] == "footer"
+    assert compacted[1].startswith("x y x y")
+    assert compacted[-2].rstrip().endswith("x y")
@@ -0,0 +1,164 @@
+import pytest
+
+from termixai import command_cache as command_cache_module
+from termixai import policy
+
+
+@pytest.fixture
+def command_policy(monkeypatch):
+    """A policy with the built-in rules only, whatever the local config.json says."""
+    def defaults(section, key, default=None):
+        return default
+
+    monkeypatch.setattr(policy, "get_setting", defaults)
+    monkeypatch.setattr(command_cache_module, "get_setting", defaults)
+    monkeypatch.setattr(policy, "command_cache", command_cache_module.CommandCache())
+    return policy.CommandPolicy()
+
+
+ALLOWED = [
+    "ls -la /etc",
+    "df -h",
+    "free -m",
+    "uname -a",
+    "cat /etc/os-release",
+    "cat < /etc/hosts",
+    "tail -n 20 /var/log/syslog",
+    "sort -r names",
+    "date +%s",
+    "ps aux | grep nginx",
+    "ps aux --sort=-rss | head -n 20",
+    "grep -r TODO . 2>/dev/null",
+    "rg foo src",
+    "find . -name '*.py'",
+    "du -sh /var/log",
+    "hostname",
+    "hostname -f",
+    "hostname --fqdn",
+    "hostname -I",
+    "git status",
+    "git log --oneline -5",
+    "git diff HEAD~1",
+    "git show HEAD:README.md",
+    "git branch",
+    "git branch -a",
+    "git branch -vv",
+    "git branch --show-current",
+    "git remote -v",
+    "git config --get user.name",
+    "systemctl status nginx",
+    "journalctl -u nginx -n 50",
+    "ls && pwd",
+    "/usr/bin/ls -l",
+]
+
+DENIED = [
+    # writes files
+    "ls > /tmp/listing",
+    "echo hi >> ~/.bashrc",
+    "sort -o /etc/passwd names",
+    "git diff --output=/home/u/.bashrc",
+    "git log --output=/tmp/x",
+    "git show --output /tmp/x",
+    "hostname --file /tmp/x",
+    "file -C -m magic",
+    "file --co -m magic",
+    "sort --ou=/etc/passwd names",
+    "cat <> /tmp/created",
+    "cat 0<> /tmp/created",
+    # changes state
+    "git branch -D main",
+    "git branch -d old",
+    "git branch -m old new",
+    "git branch newbranch",
+    "git remote remove origin",
+    "git remote add origin https://example.com/repo.git",
+    "git remote rename origin upstream",
+    "git checkout main",
+    "git push",
+    "hostname newname",
+    "hostname -b newname",
+    "hostname -F /etc/hostname",
+    "date -s '2020-01-01'",
+    "date --s=2020-01-01",
+    "dmesg -c",
+    "dmesg --cl",
+    "journalctl --vacuum-size=1M",
+    "journalctl --rot",
+    "systemctl restart nginx",
+    # runs other programs
+    "rg --pre=sh foo",
+    "rg --pre sh foo",
+    "sort --compress-program=sh names",
+    "sort --co=sh names",
+    "git diff --ext-diff",
+    "find . -exec rm {} ;",
+    "find . -delete",
+    "env rm -rf /",
+    "echo $(rm -rf /)",
+    "echo `id`",
+    "(ls)",
+    "ls &",
+    "./script.sh",
+    "/tmp/ls",
+    "FOO=bar ls",
+    # destructive or privileged
+    "rm -rf /tmp/x",
+    "sudo ls",
+    "kill -9 1",
+    "dd if=/dev/zero of=/dev/sda",
+    # never ends
+    "tail -f /var/log/syslog",
+    "tail -F /var/log/syslog",
+    "tail --follow=name /var/log/syslog",
+    "tail --fo /var/log/syslog",
+    "journalctl --follow",
+    # not known
+    "curl https://example.com",
+    "python3 -c 'print(1)'",
+    "cat <<EOF",
+    "ls ;| wc",
+    "",
+]
+
+
+@pytest.mark.parametrize("command", ALLOWED)
+def test_read_only_commands_run_without_asking(command_policy, command):
+    assert command_policy.check(command) is None
+
+
+@pytest.mark.parametrize("command", DENIED)
+def test_commands_that_write_or_run_programs_ask_first(command_policy, command):
+    assert command_policy.check(command) is not None
+
+
+def test_disabled_policy_asks_for_everything(command_policy):
+    command_policy._load()
+    command_policy.enabled = False
+    assert command_policy.check("ls") == "auto-approval is off"
+
+
+def test_native_tool_calls_follow_deny_rules(command_policy, monkeypatch):
+    monkeypatch.setattr(policy, "get_setting", lambda section, key, default=None:
+                        ["read_file path=/etc/shadow( .*)?"] if key == "deny" else default)
+    assert command_policy.check_tool("read_file path=/etc/hosts") is None
+    assert command_policy.check_tool("read_file path=/etc/shadow max_lines=5") is not None
+
+
+def test_split_command_checks_redirections():
+    assert policy.split_command("ls -l 2>/dev/null | wc -l") == [["ls", "-l"], ["wc", "-l"]]
+    assert policy.split_command("ls 2>&1") == [["ls"]]
+    with pytest.raises(ValueError, match="writes to out.txt"):
+        policy.split_command("ls > out.txt")
+
+
+def test_only_commands_that_may_change_state_clear_the_command_cache(command_policy):
+    from termixai.executor import CommandResult
+
+    cache = policy.command_cache
+    cache.put("uname -a", CommandResult("uname -a", 0, "Linux", 0.01))
+    for command in ("ls -la", "cat /etc/hosts", "ps aux | grep nginx", "grep -r foo ."):
+        command_policy.note_approved(command)
+    assert cache.get("uname -a") is not None
+    command_policy.note_approved("touch /tmp/x")
+    assert cache.get("uname -a") is None
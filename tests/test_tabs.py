@@ -0,0 +1,23 @@
+import asyncio
+
+from termixai.inface import ChatUI
+
+
+def test_tab_shortcuts_work_while_the_input_has_focus():
+    async def run():
+        app = ChatUI()
+        async with app.run_test(size=(120, 40)) as pilot:
+            await pilot.pause()
+            await pilot.press("ctrl+n")
+            await pilot.pause()
+            view = app.active_view
+            assert len(app.query("SessionView")) == 2
+            assert app.focused is view.input_field
+
+            view.input_field.value = "two words"
+            await pilot.press("ctrl+w")
+            await pilot.pause()
+            assert len(app.query("SessionView")) == 1
+            assert app.active_view is not view
+
+    asyncio.run(run())
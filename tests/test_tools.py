@@ -0,0 +1,12 @@
+from termixai import tools
+
+
+def test_builtin_tools_follow_the_config_on_first_use(monkeypatch):
+    native = {"value": True}
+    monkeypatch.setattr(tools, "get_setting", lambda section, key, default=None:
+                        native["value"] if key == "native" else default)
+    registry = tools.ToolRegistry(tools.builtin_tools)
+    ## changed after the registry is created, but before anything asks for a tool
+    native["value"] = False
+    assert [schema["function"]["name"] for schema in registry.schemas()] == [tools.SHELL_TOOL]
+    assert registry.get("read_file") is None